@@ -2,28 +2,113 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.typing import ConfigType
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.storage import Store
+from datetime import timedelta
+import aiohttp
 import logging
 
+from .const import DEFAULT_UPDATE_INTERVAL
+from .coordinator import CACHE_STORAGE_VERSION, UNAVAILABLE_AFTER, UNAVAILABLE_FAILURES, SavantDataUpdateCoordinator, build_input_names
+from .hub import async_get_hub
+from .services import async_register_services
+
 DOMAIN = "savant_ipaudio"
 _LOGGER = logging.getLogger(__name__)
 
+PLATFORMS = ["media_player", "sensor", "binary_sensor"]
+
+
+def _update_interval(entry: ConfigEntry) -> timedelta:
+    """Poll interval from the options, falling back to the value given at setup."""
+    seconds = entry.options.get("update_interval", entry.data.get("update_interval", DEFAULT_UPDATE_INTERVAL))
+    return timedelta(seconds=int(seconds))
+
+
+def _cache_key(entry: ConfigEntry) -> str:
+    """Storage key of the entry's topology cache."""
+    return f"{DOMAIN}.{entry.entry_id}"
+
+
+def _degraded_limits(entry: ConfigEntry) -> tuple[timedelta, int]:
+    """How long, and for how many failed polls, last known state is shown before going unavailable."""
+    unavailable_after = entry.options.get("unavailable_after", UNAVAILABLE_AFTER.total_seconds())
+    return (
+        timedelta(seconds=int(unavailable_after)),
+        int(entry.options.get("unavailable_failures", UNAVAILABLE_FAILURES)),
+    )
+
 async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     """Set up the Savant IP Audio component."""
     _LOGGER.debug("SAVANT SETUP CALLED")
+    async_register_services(hass)
     return True
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Savant IP Audio from a config entry."""
     _LOGGER.debug("SAVANT SETUP ENTRY CALLED with data: %s", entry.data)
+    host = entry.data["host"]
+    update_interval = _update_interval(entry)
+    unavailable_after, unavailable_failures = _degraded_limits(entry)
+    hub = async_get_hub(hass)
+    # Create coordinator, shared by all platforms
+    coordinator = SavantDataUpdateCoordinator(
+        hass,
+        host,
+        aiohttp.BasicAuth(entry.data["username"], entry.data["password"]),
+        update_interval=update_interval,
+        name=f"{DOMAIN}-{entry.entry_id}",
+        hub=hub,
+        cache_key=_cache_key(entry),
+        unavailable_after=unavailable_after,
+        unavailable_failures=unavailable_failures,
+    )
+
+    if await coordinator.async_load_cache():
+        # Create entities from the cached topology right away and refresh in the background
+        entry.async_create_background_task(
+            hass, coordinator.async_background_first_refresh(), f"{DOMAIN} first refresh {host}"
+        )
+    else:
+        # Initial data fetch
+        try:
+            await coordinator.async_config_entry_first_refresh()
+        except Exception:
+            # Not in the hub yet, so async_remove would never close its session
+            await hub.async_release_host(host)
+            raise
+
+    # Track the coordinator in the hub, which also staggers its polls against other amps
+    hub.async_add(entry.entry_id, coordinator)
+
+    # Apply options changes to the running coordinator instead of reloading
+    entry.async_on_unload(entry.add_update_listener(async_update_options))
+
     try:
-        await hass.config_entries.async_forward_entry_setups(entry, ["media_player"])
+        await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
         _LOGGER.debug("SAVANT SETUP ENTRY SUCCESS")
         return True
     except Exception as e:
         _LOGGER.error("Failed to setup Savant IP Audio: %s", str(e), exc_info=True)
         return False
 
+async def async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Apply changed input names, poll interval and degraded-mode limits in place, without any requests."""
+    coordinator = async_get_hub(hass).get(entry.entry_id)
+    if coordinator is None:
+        return
+    _LOGGER.debug("Applying options for %s: %s", coordinator.host, entry.options)
+    coordinator.async_apply_options(
+        build_input_names(coordinator.data, entry.options), _update_interval(entry), *_degraded_limits(entry)
+    )
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     _LOGGER.debug("SAVANT UNLOAD ENTRY CALLED")
-    return await hass.config_entries.async_forward_entry_unload(entry, "media_player")
+    unloaded = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    if unloaded:
+        await async_get_hub(hass).async_remove(entry.entry_id)
+    return unloaded
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Delete the entry's topology cache when the entry is removed."""
+    await Store(hass, CACHE_STORAGE_VERSION, _cache_key(entry)).async_remove()
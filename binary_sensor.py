@@ -0,0 +1,85 @@
+"""Per-zone and per-input signal/streamer binary sensors for Savant IP Audio."""
+from __future__ import annotations
+import logging
+from homeassistant.components.binary_sensor import BinarySensorEntity
+from homeassistant.const import EntityCategory
+from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from .const import DOMAIN
+from .coordinator import input_context
+from .hub import async_get_hub
+from .sensor import STATUS_IDENTITY_KEYS
+
+_LOGGER = logging.getLogger(__name__)
+
+async def async_setup_entry(hass, config_entry, async_add_entities):
+    """Set up the Savant IP Audio binary sensors."""
+    coordinator = async_get_hub(hass).get(config_entry.entry_id)
+    device_id = coordinator.data.status.savant_id or config_entry.data["host"]
+    data = coordinator.data
+    entities = []
+    for key, value in data.status.raw.items():
+        if key not in STATUS_IDENTITY_KEYS and isinstance(value, bool):
+            entities.append(SavantStatusBinarySensor(coordinator, device_id, key))
+    for port, output in data.outputs.items():
+        for key, value in output.extra.items():
+            if isinstance(value, bool):
+                entities.append(SavantOutputBinarySensor(coordinator, device_id, port, key))
+    for port, inp in data.inputs.items():
+        for key, value in inp.extra.items():
+            if isinstance(value, bool):
+                entities.append(SavantInputBinarySensor(coordinator, device_id, port, key))
+    async_add_entities(entities)
+
+class SavantBinarySensor(CoordinatorEntity, BinarySensorEntity):
+    """Base for boolean fields read from the coordinator's data."""
+
+    def __init__(self, coordinator, device_id, key, unique_suffix, name, context=None):
+        super().__init__(coordinator, context=context)
+        self._key = key
+        self._attr_unique_id = f"{device_id}_{unique_suffix}"
+        self._attr_name = f"Savant {device_id[:12]} {name}"
+        self._attr_device_info = DeviceInfo(identifiers={(DOMAIN, device_id)})
+
+class SavantStatusBinarySensor(SavantBinarySensor):
+    """A boolean device health field from the status endpoint, refreshed like SavantStatusSensor."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(self, coordinator, device_id, key):
+        super().__init__(coordinator, device_id, key, f"status_{key}", key)
+
+    @property
+    def is_on(self):
+        return self.coordinator.data.status.raw.get(self._key)
+
+    async def async_update(self) -> None:
+        """Fetch status now rather than only the port state."""
+        await self.coordinator.async_request_status_refresh()
+
+class SavantOutputBinarySensor(SavantBinarySensor):
+    """A boolean per-output field, e.g. whether the zone has signal."""
+
+    def __init__(self, coordinator, device_id, port, key):
+        super().__init__(coordinator, device_id, key, f"zone_{port}_{key}", f"Output {port} {key}", context=port)
+        self._port = port
+
+    @property
+    def is_on(self):
+        output = self.coordinator.data.outputs.get(self._port)
+        return output.extra.get(self._key) if output else None
+
+class SavantInputBinarySensor(SavantBinarySensor):
+    """A boolean per-input field, e.g. signal present or streamer playing."""
+
+    def __init__(self, coordinator, device_id, port, key):
+        super().__init__(
+            coordinator, device_id, key, f"input_{port}_{key}", f"Input {port} {key}",
+            context=input_context(port),
+        )
+        self._port = port
+
+    @property
+    def is_on(self):
+        inp = self.coordinator.data.inputs.get(self._port)
+        return inp.extra.get(self._key) if inp else None
@@ -1,42 +1,57 @@
 from homeassistant import config_entries
 import voluptuous as vol
-from .const import DOMAIN
+from .const import DEFAULT_UPDATE_INTERVAL, DOMAIN
+from .coordinator import UNAVAILABLE_AFTER, UNAVAILABLE_FAILURES
+from .discovery import async_discover, async_probe, hosts_in_network
 import aiohttp
+import ipaddress
 import logging
+from homeassistant.components.network import async_get_source_ip
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
 _LOGGER = logging.getLogger(__name__)
 
-DEFAULT_UPDATE_INTERVAL = 30
+# Don't let a wrong IP leave the flow hanging
+CONNECT_TIMEOUT = aiohttp.ClientTimeout(total=10)
 
 class SavantConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     VERSION = 1
 
+    def __init__(self):
+        self._discovered = {}  # host -> {"host", "chassis", "savantID"}
+        self._credentials = {}
+
     async def async_step_user(self, user_input=None):
         _LOGGER.debug("Starting Savant IP Audio configuration flow")
+        return self.async_show_menu(step_id="user", menu_options=["discover", "manual"])
+
+    async def _async_can_connect(self, user_input) -> bool:
+        """Validate connection using the same endpoint and auth as the integration."""
+        try:
+            session = async_get_clientsession(self.hass)
+            auth = aiohttp.BasicAuth(user_input["username"], user_input["password"])
+            url = f"http://{user_input['host']}/cgi-bin/avswitch?action=showAllAudioPortsInJson"
+            _LOGGER.debug("Attempting to connect to %s", url)
+            async with session.get(url, auth=auth, timeout=CONNECT_TIMEOUT) as resp:
+                if resp.status == 200:
+                    _LOGGER.debug("Successfully connected to Savant device")
+                    return True
+                _LOGGER.error("Connection failed: status %s, reason: %s", resp.status, resp.reason)
+        except Exception as e:
+            _LOGGER.error("Failed to connect to Savant IP Audio: %s", str(e), exc_info=True)
+        return False
+
+    async def async_step_manual(self, user_input=None):
         errors = {}
-        
+
         if user_input is not None:
             _LOGGER.debug("User input received: %s", user_input)
-            try:
-                # Validate connection using the same endpoint and auth as the integration
-                session = async_get_clientsession(self.hass)
-                auth = aiohttp.BasicAuth(user_input["username"], user_input["password"])
-                url = f"http://{user_input['host']}/cgi-bin/avswitch?action=showAllAudioPortsInJson"
-                _LOGGER.debug("Attempting to connect to %s", url)
-                async with session.get(url, auth=auth) as resp:
-                    if resp.status == 200:
-                        _LOGGER.debug("Successfully connected to Savant device")
-                        return self.async_create_entry(
-                            title="Savant IP Audio",
-                            data=user_input
-                        )
-                    else:
-                        _LOGGER.error("Connection failed: status %s, reason: %s", resp.status, resp.reason)
-                        errors["base"] = "cannot_connect"
-            except Exception as e:
-                _LOGGER.error("Failed to connect to Savant IP Audio: %s", str(e), exc_info=True)
-                errors["base"] = "cannot_connect"
+            if await self._async_can_connect(user_input):
+                return self.async_create_entry(
+                    title="Savant IP Audio",
+                    data=user_input
+                )
+            errors["base"] = "cannot_connect"
 
         schema = vol.Schema({
             vol.Required("host"): str,
@@ -46,7 +61,87 @@ class SavantConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         })
 
         return self.async_show_form(
-            step_id="user",
+            step_id="manual",
+            data_schema=schema,
+            errors=errors
+        )
+
+    async def async_step_discover(self, user_input=None):
+        """Scan a subnet for amps answering /cgi-bin/constants."""
+        errors = {}
+
+        if user_input is not None:
+            _LOGGER.debug("Scanning %s for Savant devices", user_input["network"])
+            try:
+                hosts = hosts_in_network(user_input["network"])
+            except ValueError as e:
+                _LOGGER.warning("Cannot scan %s: %s", user_input["network"], e)
+                errors["network"] = "invalid_network"
+            else:
+                # No credentials here: they only go to the amp picked in the next step
+                found = await async_discover(async_get_clientsession(self.hass), hosts)
+                configured = {entry.data.get("host") for entry in self._async_current_entries()}
+                self._discovered = {d["host"]: d for d in found if d["host"] not in configured}
+                if self._discovered:
+                    self._credentials = {
+                        "username": user_input["username"],
+                        "password": user_input["password"],
+                        "update_interval": user_input["update_interval"],
+                    }
+                    return await self.async_step_pick()
+                errors["base"] = "no_devices_found"
+
+        default_network = ""
+        try:
+            source_ip = await async_get_source_ip(self.hass)
+            default_network = str(ipaddress.ip_network(f"{source_ip}/24", strict=False))
+        except Exception as e:
+            _LOGGER.debug("Could not determine local network: %s", e)
+
+        schema = vol.Schema({
+            vol.Required("network", default=default_network): str,
+            vol.Required("username", default="RPM"): str,
+            vol.Required("password", default="RPM"): str,
+            vol.Optional("update_interval", default=DEFAULT_UPDATE_INTERVAL): vol.All(int, vol.Range(min=5, max=3600)),
+        })
+
+        return self.async_show_form(
+            step_id="discover",
+            data_schema=schema,
+            errors=errors
+        )
+
+    async def async_step_pick(self, user_input=None):
+        """Let the user choose one of the discovered amps."""
+        errors = {}
+
+        if user_input is not None:
+            device = self._discovered[user_input["host"]]
+            if not device.get("savantID"):
+                # Only found through its auth challenge; ask the chosen amp who it is
+                auth = aiohttp.BasicAuth(self._credentials["username"], self._credentials["password"])
+                identity = await async_probe(async_get_clientsession(self.hass), device["host"], auth)
+                if identity:
+                    device = identity
+            if device.get("savantID"):
+                await self.async_set_unique_id(device["savantID"])
+                self._abort_if_unique_id_configured()
+            data = {"host": device["host"], **self._credentials}
+            if await self._async_can_connect(data):
+                return self.async_create_entry(
+                    title=f"Savant IP Audio {device.get('chassis') or device['host']}",
+                    data=data
+                )
+            errors["base"] = "cannot_connect"
+
+        choices = {
+            host: f"{d.get('chassis') or 'Savant'} {d.get('savantID') or ''} ({host})".replace("  ", " ")
+            for host, d in self._discovered.items()
+        }
+        schema = vol.Schema({vol.Required("host"): vol.In(choices)})
+
+        return self.async_show_form(
+            step_id="pick",
             data_schema=schema,
             errors=errors
         )
@@ -63,31 +158,39 @@ class SavantOptionsFlow(config_entries.OptionsFlow):
 
     async def async_step_init(self, user_input=None):
         _LOGGER.debug("Starting options flow step")
+        # Current input names from the coordinator/device
+        input_names = {}
+        hub = self.hass.data.get(DOMAIN)
+        coordinator = hub.get(self.config_entry.entry_id) if hub else None
+        if coordinator and coordinator.data:
+            for port, inp in coordinator.data.inputs.items():
+                input_names[port] = inp.name
+
         if user_input is not None:
             _LOGGER.debug("Options flow user input: %s", user_input)
-            return self.async_create_entry(title="", data=user_input)
+            # Keep only real overrides, so a later rename on the amp still shows up
+            data = {
+                key: value for key, value in user_input.items()
+                if not key.startswith("input_") or (value and value != input_names.get(int(key[6:])))
+            }
+            return self.async_create_entry(title="", data=data)
+        # One name field per input the amp reports; five until it has been polled
+        ports = sorted(port for port in input_names if port != 0) or range(1, 6)
 
-        # Try to get current input names from the coordinator/device
-        hass = self.config_entry.hass if hasattr(self.config_entry, 'hass') else None
-        input_names = {}
-        if hass:
-            coordinator = hass.data.get(DOMAIN, {}).get(self.config_entry.entry_id)
-            if coordinator and hasattr(coordinator, 'data'):
-                av = coordinator.data.get("av", {})
-                for inp in av.get("inputs", []):
-                    input_names[inp["port"]] = inp.get("id", f"Input {inp['port']}")
-
-        schema = vol.Schema({
-            vol.Optional("input_1", default=self.config_entry.options.get("input_1") or input_names.get(1, "")): str,
-            vol.Optional("input_2", default=self.config_entry.options.get("input_2") or input_names.get(2, "")): str,
-            vol.Optional("input_3", default=self.config_entry.options.get("input_3") or input_names.get(3, "")): str,
-            vol.Optional("input_4", default=self.config_entry.options.get("input_4") or input_names.get(4, "")): str,
-            vol.Optional("input_5", default=self.config_entry.options.get("input_5") or input_names.get(5, "")): str,
-            vol.Optional("update_interval", default=self.config_entry.data.get("update_interval", DEFAULT_UPDATE_INTERVAL)): vol.All(int, vol.Range(min=5, max=3600)),
-        })
+        options = self.config_entry.options
+        # Only real overrides are pre-filled: storing the amp's own names would hide later renames on the amp
+        fields = {vol.Optional(f"input_{port}", default=options.get(f"input_{port}", "")): str for port in ports}
+        amp_names = "\n".join(f"- Input {port}: {input_names.get(port, '?')}" for port in ports)
+        update_interval = options.get("update_interval", self.config_entry.data.get("update_interval", DEFAULT_UPDATE_INTERVAL))
+        fields[vol.Optional("update_interval", default=update_interval)] = vol.All(int, vol.Range(min=5, max=3600))
+        # Keep showing the last known state through short outages before going unavailable
+        fields[vol.Optional("unavailable_after", default=options.get("unavailable_after", int(UNAVAILABLE_AFTER.total_seconds())))] = vol.All(int, vol.Range(min=0, max=3600))
+        fields[vol.Optional("unavailable_failures", default=options.get("unavailable_failures", UNAVAILABLE_FAILURES))] = vol.All(int, vol.Range(min=1, max=100))
+        schema = vol.Schema(fields)
 
         return self.async_show_form(
             step_id="init",
             data_schema=schema,
+            description_placeholders={"amp_names": amp_names},
             errors={}
         )
@@ -1 +1,6 @@
 DOMAIN = "savant_ipaudio"
+
+# Poll interval (seconds) when none is configured
+DEFAULT_UPDATE_INTERVAL = 30
+# Most requests allowed in flight to a single amp at once
+MAX_REQUESTS_PER_HOST = 2
@@ -1,13 +1,76 @@
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.util import dt as dt_util
 import aiohttp
 import logging
 from datetime import timedelta
 import asyncio
+import hashlib
+import math
+
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+from .const import MAX_REQUESTS_PER_HOST
+from .models import PendingCommand, SavantState, volume_to_db
+from .pipeline import BREAKER_CLOSED, REQUEST_TIMEOUT, CircuitOpenError, CommandPipeline
+from .stats import EndpointStats
 
 _LOGGER = logging.getLogger(__name__)
 
+# How long setAudio writes are gathered before being sent as one POST
+WRITE_COALESCE_WINDOW = 0.15
+# After user activity poll quickly for a while, then fall back to the idle interval
+FAST_POLL_INTERVAL = timedelta(seconds=2)
+FAST_POLL_DURATION = 20
+# Delay before the single refresh that confirms a burst of writes
+CONFIRM_REFRESH_DELAY = 1.0
+# Per-endpoint refresh policy: AV port state follows the poll interval, while
+# status (firmware, chassis, IP, savantID) is refreshed on this much longer
+# cadence or on demand. Constants are fetched once at startup.
+STATUS_REFRESH_INTERVAL = timedelta(minutes=30)
+# Topology cache (constants, status, ports and inputs) kept in HA storage
+CACHE_STORAGE_VERSION = 1
+CACHE_SAVE_DELAY = 10
+# How long an optimistic value is kept over polls that disagree before rolling it back
+PENDING_COMMAND_TIMEOUT = 10
+# setAudio field name -> OutputState field, with a parser for the form value
+COMMAND_FIELDS = {
+    "volume": ("volume_db", int),
+    "mute": ("mute", lambda value: value == "muted"),
+    "inputsrc": ("inputsrc", int),
+}
+# Failed polls keep serving the last good data (marked stale) until it is this old ...
+UNAVAILABLE_AFTER = timedelta(minutes=2)
+# ... or this many polls in a row have failed; then entities become unavailable
+UNAVAILABLE_FAILURES = 4
+# Minimum time between setAudio writes while a volume ramp is running
+RAMP_STEP_INTERVAL = 0.25
+# Endpoints tracked in endpoint_stats
+ENDPOINTS = ("status", "constants", "ports", "setAudio")
+# Listener context for entities that want every poll (e.g. diagnostic sensors)
+STATS_CONTEXT = "stats"
+# Listener context notified only when everything may have changed, e.g. ports came or went
+TOPOLOGY_CONTEXT = "topology"
+
+def input_context(port: int) -> tuple:
+    """Listener context for entities that follow an input rather than an output."""
+    return ("input", port)
+
+def build_input_names(data: SavantState, options) -> dict:
+    """Input port -> display name: the amp's names with the user's overrides applied."""
+    input_names = {}
+    for port, inp in data.inputs.items():
+        input_names[port] = options.get(f"input_{port}") or inp.name
+    # Input 0 is always 'Off'
+    input_names.setdefault(0, "Off")
+    return input_names
+
 class SavantDataUpdateCoordinator(DataUpdateCoordinator):
     """Coordinator for Savant IP Audio data."""
 
@@ -18,6 +81,10 @@ class SavantDataUpdateCoordinator(DataUpdateCoordinator):
         auth: aiohttp.BasicAuth,
         update_interval: timedelta = timedelta(seconds=15),
         name: str = "savant_ipaudio",
+        hub=None,
+        cache_key: str | None = None,
+        unavailable_after: timedelta = UNAVAILABLE_AFTER,
+        unavailable_failures: int = UNAVAILABLE_FAILURES,
     ):
         """Initialize the coordinator."""
         super().__init__(
@@ -28,55 +95,471 @@ class SavantDataUpdateCoordinator(DataUpdateCoordinator):
         )
         self.host = host
         self.auth = auth
-        self.session = async_get_clientsession(hass)
+        if hub is not None:
+            # Share the hub's keep-alive pool and in-flight budget for this host
+            self.session = hub.session_for(host)
+            request_slot = hub.request_slot(host)
+        else:
+            self.session = async_get_clientsession(hass)
+            request_slot = asyncio.Semaphore(MAX_REQUESTS_PER_HOST)
+        # Orders writes, bounds concurrency, retries and trips the breaker for this amp
+        self._pipeline = CommandPipeline(request_slot)
         self.constants = None  # Will hold model/chassis info
+        self.input_names = {}  # input port -> display name, set up by media_player
         # Initialize data structure
-        self.data = {
-            "status": {},
-            "av": {"outputs": []},
-            "constants": {},
+        self.data = SavantState.empty()
+        # Cached /cgi-bin/status, reused between status refreshes
+        self._status = {}
+        self._status_fetched_at = None
+        self._status_refresh_requested = True
+        # Last raw showAllAudioPortsInJson response, persisted as part of the topology cache
+        self._av = {}
+        # Digest and decoded JSON of the last body per endpoint, to skip identical responses
+        self._bodies = {}
+        self.decode_stats = {"decoded": 0, "skipped": 0, "polls_unchanged": 0}
+        # Ports changed locally (optimistically) since the last parse
+        self._dirty_ports = set()
+        # Unconfirmed commands: (port, field) -> PendingCommand
+        self._pending = {}
+        self._command_seq = 0
+        self._store = Store(hass, CACHE_STORAGE_VERSION, cache_key) if cache_key else None
+        # True while data comes from the cache or from before failing polls
+        self.stale = False
+        # Degraded mode: how long, and for how many failed polls, stale data is served
+        self.unavailable_after = unavailable_after
+        self.unavailable_failures = unavailable_failures
+        self.consecutive_failures = 0
+        # When a poll was last parsed and accepted; a 200 with an unusable body does not count
+        self.last_good_update = None
+        # Write coalescing: pending outputN.field values and the batch waiting on them
+        self._pending_writes = {}
+        self._write_batch = None
+        self._write_timer = None
+        self.write_stats = {
+            "calls": 0,
+            "fields_queued": 0,
+            "fields_sent": 0,
+            "requests_sent": 0,
+            "requests_saved": 0,
         }
+        # Diff-based dispatch: ports changed by the last update, None means notify everyone
+        self._changed_ports = None
+        self._dispatched_success = True
+        self.dispatch_stats = {"writes": 0, "suppressed": 0}
+        # Instrumentation
+        self.endpoint_stats = {endpoint: EndpointStats() for endpoint in ENDPOINTS}
+        self.optimistic_rollbacks = 0
+        # Saved zone states for snapshot/restore: name -> {port: (inputsrc, volume_db, mute)}
+        self._snapshots = {}
+        # Running volume ramps: port -> task driving it (one task may own several ports)
+        self._ramps = {}
+        # Adaptive polling: configured interval when idle, fast for a while after activity
+        self._idle_interval = update_interval
+        self._fast_poll_until = 0.0
+        self._confirm_refresh = Debouncer(
+            hass,
+            _LOGGER,
+            cooldown=CONFIRM_REFRESH_DELAY,
+            immediate=False,
+            function=self.async_refresh,
+        )
         _LOGGER.debug("Initialized SavantDataUpdateCoordinator for host %s", host)
 
     async def async_config_entry_first_refresh(self):
         # Fetch constants once at startup
         base = f"http://{self.host}"
         self.constants = await self._fetch_constants(base)
-        self.data["constants"] = self.constants
+        self.data.constants = self.constants
         await super().async_config_entry_first_refresh()
 
-    async def _async_update_data(self) -> dict:
-        """Fetch all data from the Savant device in one call (status and AV only)."""
+    async def async_load_cache(self) -> bool:
+        """Load the last known topology from storage into self.data (marked stale)."""
+        if self._store is None:
+            return False
+        cached = await self._store.async_load()
+        if not cached or not cached.get("av", {}).get("outputs"):
+            return False
+        self.constants = cached.get("constants", {})
+        self._status = cached.get("status", {})
+        self._av = cached["av"]
+        self.data = SavantState.from_json(self._status, self._av, self.constants)
+        self.stale = True
+        _LOGGER.debug("Loaded cached topology for %s with %s outputs", self.host, len(self.data.outputs))
+        return True
+
+    async def async_background_first_refresh(self) -> None:
+        """Fetch constants and the first poll after starting from the cache."""
+        constants = await self._fetch_constants(f"http://{self.host}")
+        if constants:
+            self.constants = constants
+        await self.async_refresh()
+
+    def _cache_payload(self) -> dict:
+        return {"constants": self.constants or {}, "status": self._status, "av": self._av}
+
+    async def _async_update_data(self) -> SavantState:
+        """Fetch AV port state, plus status when it is due (status and AV only)."""
+        if self._ramps:
+            # A fade is writing volumes; polling now would only fight it
+            _LOGGER.debug("Volume ramp running on %s, skipping poll", self.host)
+            self._changed_ports = set()
+            return self.data
         try:
             _LOGGER.debug("Fetching data from Savant device at %s", self.host)
             base = f"http://{self.host}"
-            # Fetch status and audio ports concurrently
-            async with asyncio.TaskGroup() as tg:
-                status_task = tg.create_task(self._fetch_status(base))
-                av_task = tg.create_task(self._fetch_audio_ports(base))
-            # Combine the data, reusing constants
-            data = {
-                "status": status_task.result(),
-                "av": av_task.result(),
-                "constants": self.constants or {},
-            }
-            _LOGGER.debug("Successfully fetched all data: %s", data)
+            status_changed = False
+            if self._status_due() and self._pipeline.breaker.state == BREAKER_CLOSED:
+                # Fetch status and audio ports concurrently. While the breaker is not
+                # closed the ports request alone is the trial, and status waits.
+                # gather rather than a TaskGroup: one failing must not cancel the other
+                status, av = await asyncio.gather(
+                    self._fetch_status(base), self._fetch_audio_ports(base), return_exceptions=True
+                )
+                if isinstance(av, BaseException):
+                    raise av
+                # _fetch_status returns {} on failure; keep the cache and retry next poll
+                if status:
+                    status_changed = status is not self._status
+                    self._status = status
+                    self._status_fetched_at = self.hass.loop.time()
+                    self._status_refresh_requested = False
+            else:
+                av = await self._fetch_audio_ports(base)
+            if not av.get("outputs") and self.data.outputs:
+                # An amp does not lose all its zones; treat it as a bad poll, not a new topology
+                raise UpdateFailed(f"Savant device at {self.host} reported no outputs")
+            if (
+                av is self._av
+                and not status_changed
+                and not self._dirty_ports
+                and not self._pending
+                and not self.stale
+            ):
+                # Byte-identical responses and nothing changed locally: reuse the snapshot
+                self.decode_stats["polls_unchanged"] += 1
+                self._changed_ports = set()
+                self._accept_poll()
+                return self.data
+            # Parse once into port-indexed state, reusing constants and cached status
+            data = SavantState.from_json(self._status, av, self.constants or {})
+            _LOGGER.debug("Successfully fetched data for %s outputs", len(data.outputs))
+            self._av = av
+            self._dirty_ports = set()
+            self._merge_pending(data)
+            self._changed_ports = self._diff_ports(self.data, data)
+            if self.stale:
+                # Entities show a stale flag until the first real poll
+                self.stale = False
+                self._changed_ports = None
+            if self._changed_ports is None and self._store is not None:
+                # Topology, status or constants changed, persist them for the next startup
+                self._store.async_delay_save(self._cache_payload, CACHE_SAVE_DELAY)
+            self._accept_poll()
             return data
+        except CircuitOpenError as err:
+            # The amp has been failing; skip polling it until the breaker lets a trial through.
+            # Skipped polls are not new failures, but the served data keeps ageing.
+            _LOGGER.debug("Skipping poll of %s: %s", self.host, err)
+            return self._last_good_or_raise(err, f"Savant device at {self.host} is not responding")
         except Exception as err:
+            self.consecutive_failures += 1
             _LOGGER.error("Error communicating with Savant device: %s", err, exc_info=True)
-            raise UpdateFailed(f"Error communicating with Savant device: {err}")
+            return self._last_good_or_raise(err, f"Error communicating with Savant device: {err}")
+        finally:
+            self._update_poll_interval()
+
+    def _accept_poll(self) -> None:
+        """Note a poll that was fetched, parsed and accepted as the current state."""
+        self.consecutive_failures = 0
+        self.last_good_update = dt_util.utcnow()
+
+    def _last_good_or_raise(self, err: Exception, message: str) -> SavantState:
+        """Serve the last good data through a short outage, or fail the update.
+
+        Entities stay available, marked stale, until the last good poll is
+        older than unavailable_after or unavailable_failures polls in a row
+        have failed. This keeps a brief stall on the amp from flapping every
+        entity to unavailable and back.
+        """
+        last_good = self.last_good_update
+        if (
+            last_good is None
+            or not self.data.outputs
+            or dt_util.utcnow() - last_good >= self.unavailable_after
+            or self.consecutive_failures >= self.unavailable_failures
+        ):
+            raise UpdateFailed(message) from err
+        if self.stale:
+            self._changed_ports = set()
+        else:
+            _LOGGER.warning("%s, keeping the state from %s", message, last_good.isoformat())
+            self.stale = True
+            # Every entity writes once to show it is stale
+            self._changed_ports = None
+        return self.data
+
+    def stale_attributes(self) -> dict | None:
+        """Entity attributes telling how old the shown state is, or None when it is current.
+
+        An absolute timestamp rather than an age, which would only be as
+        fresh as the entity's last state write.
+        """
+        if not self.stale:
+            return None
+        attributes = {"stale": True}
+        if self.last_good_update is not None:
+            attributes["last_good_update"] = self.last_good_update.isoformat()
+        return attributes
+
+    def _set_optimistic(self, port: int, field: str, value) -> None:
+        """Apply a commanded value locally and track it until a poll confirms it."""
+        self._command_seq += 1
+        self._pending[(port, field)] = PendingCommand(
+            self._command_seq, value, self.hass.loop.time() + PENDING_COMMAND_TIMEOUT
+        )
+        output = self.data.outputs.get(port)
+        if output is not None:
+            output.apply(field, value)
+
+    def _merge_pending(self, data: SavantState) -> None:
+        """Keep optimistic values over a poll until the amp confirms them or they time out.
+
+        A poll that started before a setAudio took effect would otherwise
+        replace the optimistic value and make the UI jump back and forth.
+        """
+        now = self.hass.loop.time()
+        for (port, field), command in list(self._pending.items()):
+            output = data.outputs.get(port)
+            if output is None:
+                del self._pending[(port, field)]
+            elif getattr(output, field) == command.expected:
+                # Confirmed by the amp
+                del self._pending[(port, field)]
+            elif now >= command.deadline:
+                _LOGGER.debug(
+                    "Port %s %s never became %s (command %s), rolling back",
+                    port, field, command.expected, command.seq,
+                )
+                del self._pending[(port, field)]
+                self.optimistic_rollbacks += 1
+            else:
+                output.apply(field, command.expected)
+
+    def _drop_pending(self, fields: dict) -> None:
+        """Forget pending commands whose setAudio write failed, so the next poll shows the truth."""
+        for key, value in fields.items():
+            name, _, form_field = key.partition(".")
+            if form_field not in COMMAND_FIELDS:
+                continue
+            field, parse = COMMAND_FIELDS[form_field]
+            port = int(name[len("output"):])
+            command = self._pending.get((port, field))
+            # A newer command for the same field may be waiting in the next batch
+            if command is not None and command.expected == parse(value):
+                del self._pending[(port, field)]
+
+    def _status_due(self) -> bool:
+        """Return True when status should be fetched with this poll."""
+        if self._status_refresh_requested or self._status_fetched_at is None:
+            return True
+        return self.hass.loop.time() - self._status_fetched_at >= STATUS_REFRESH_INTERVAL.total_seconds()
+
+    async def async_request_status_refresh(self) -> None:
+        """Fetch status with the next refresh instead of waiting for its interval."""
+        self._status_refresh_requested = True
+        await self.async_request_refresh()
+
+    def _update_poll_interval(self) -> None:
+        """Back off to the idle interval once the fast-poll period has passed."""
+        if self.update_interval != self._idle_interval and self.hass.loop.time() >= self._fast_poll_until:
+            _LOGGER.debug("No recent activity, polling every %s", self._idle_interval)
+            self.update_interval = self._idle_interval
+
+    @callback
+    def async_apply_options(
+        self,
+        input_names: dict,
+        update_interval: timedelta,
+        unavailable_after: timedelta = UNAVAILABLE_AFTER,
+        unavailable_failures: int = UNAVAILABLE_FAILURES,
+    ) -> None:
+        """Apply new input names, poll interval and degraded-mode limits in place, without a refresh."""
+        self.input_names = input_names
+        self.unavailable_after = unavailable_after
+        self.unavailable_failures = unavailable_failures
+        if update_interval != self._idle_interval:
+            _LOGGER.debug("Idle poll interval for %s is now %s", self.host, update_interval)
+            self._idle_interval = update_interval
+            if self.update_interval != FAST_POLL_INTERVAL:
+                self.update_interval = update_interval
+                if self._listeners:
+                    # Reschedule now rather than after the old interval runs out
+                    self._schedule_refresh()
+        # Entities pick up the new names from self.input_names; every one has to write
+        for update_callback, _context in list(self._listeners.values()):
+            update_callback()
+
+    async def _async_note_activity(self) -> None:
+        """Switch to fast polling and schedule one confirming refresh for the burst."""
+        self._fast_poll_until = self.hass.loop.time() + FAST_POLL_DURATION
+        if self._idle_interval > FAST_POLL_INTERVAL and self.update_interval != FAST_POLL_INTERVAL:
+            _LOGGER.debug("Activity on %s, polling every %s", self.host, FAST_POLL_INTERVAL)
+            self.update_interval = FAST_POLL_INTERVAL
+        await self._confirm_refresh.async_call()
+
+    async def _async_post_once(self, url: str, fields: dict) -> None:
+        """Make one setAudio POST attempt, recording its stats."""
+        stats = self.endpoint_stats["setAudio"]
+        start = self.hass.loop.time()
+        try:
+            async with self.session.post(url, data=fields, auth=self.auth, timeout=REQUEST_TIMEOUT) as resp:
+                resp.raise_for_status()
+                body = await resp.read()
+        except Exception as err:
+            stats.record_error(err, timeout=isinstance(err, asyncio.TimeoutError))
+            raise
+        stats.record(self.hass.loop.time() - start, len(body))
+
+    def diagnostics(self) -> dict:
+        """Return instrumentation for the diagnostics platform."""
+        return {
+            "host": self.host,
+            "last_update_success": self.last_update_success,
+            "update_interval": str(self.update_interval),
+            "idle_interval": str(self._idle_interval),
+            "stale": self.stale,
+            "consecutive_failures": self.consecutive_failures,
+            "last_good_update": self.last_good_update.isoformat() if self.last_good_update else None,
+            "unavailable_after": str(self.unavailable_after),
+            "unavailable_failures": self.unavailable_failures,
+            "outputs": len(self.data.outputs),
+            "inputs": len(self.data.inputs),
+            "endpoints": {name: stats.as_dict() for name, stats in self.endpoint_stats.items()},
+            "writes": dict(self.write_stats),
+            "dispatch": dict(self.dispatch_stats),
+            "decode": dict(self.decode_stats),
+            "optimistic_rollbacks": self.optimistic_rollbacks,
+            "pending_commands": len(self._pending),
+            "circuit_breaker": self._pipeline.breaker.as_dict(),
+            "retries": self._pipeline.retries,
+        }
+
+    async def async_shutdown(self) -> None:
+        """Cancel pending refreshes, ramps and writes owned by the coordinator, and save the cache."""
+        self._confirm_refresh.async_cancel()
+        self._cancel_ramps(*self._ramps)
+        if self._write_timer is not None:
+            self._write_timer.cancel()
+            self._write_timer = None
+        if self._write_batch is not None:
+            self._write_batch.cancel()
+            self._write_batch = None
+        self._pending_writes = {}
+        if self._store is not None and self._av.get("outputs"):
+            # Write now instead of leaving a delayed save behind, which could
+            # recreate the file after async_remove_entry has deleted it
+            await self._store.async_save(self._cache_payload())
+        await super().async_shutdown()
+
+    @staticmethod
+    def _diff_ports(previous: SavantState, current: SavantState):
+        """Return the listener contexts whose state changed, or None if everything may have.
+
+        Output ports are returned as plain ints, inputs as input_context(port).
+        """
+        if (
+            previous is None
+            or previous.status != current.status
+            or previous.constants != current.constants
+            or previous.outputs.keys() != current.outputs.keys()
+            or previous.inputs.keys() != current.inputs.keys()
+            # A renamed input changes every zone's source list
+            or any(previous.inputs[port].name != inp.name for port, inp in current.inputs.items())
+        ):
+            return None
+        changed = {port for port, output in current.outputs.items() if previous.outputs[port] != output}
+        changed.update(
+            input_context(port) for port, inp in current.inputs.items() if previous.inputs[port] != inp
+        )
+        return changed
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Notify only the listeners whose port changed since the last dispatch.
+
+        Entities register with their output port as listener context. Listeners
+        without a context are notified whenever anything changed,
+        STATS_CONTEXT listeners after every update, and TOPOLOGY_CONTEXT
+        listeners only when everything may have changed.
+        """
+        changed, self._changed_ports = self._changed_ports, None
+        if self.last_update_success != self._dispatched_success:
+            # Availability flipped, every entity has to write its state
+            self._dispatched_success = self.last_update_success
+            changed = None
+        elif not self.last_update_success:
+            # Still failing, nothing new to show
+            changed = set()
+        for update_callback, context in list(self._listeners.values()):
+            if (
+                changed is None
+                or context == STATS_CONTEXT
+                or (changed and (context is None or context in changed))
+            ):
+                self.dispatch_stats["writes"] += 1
+                update_callback()
+            else:
+                self.dispatch_stats["suppressed"] += 1
+
+    @callback
+    def _async_notify_ports(self, *ports: int) -> None:
+        """Dispatch a local (optimistic) change to the given ports only."""
+        self._dirty_ports.update(ports)
+        self._changed_ports = set(ports)
+        self.async_update_listeners()
+
+    async def _async_get_json(self, endpoint: str, url: str):
+        """GET a JSON endpoint through the amp's request pipeline."""
+        return await self._pipeline.async_request(lambda: self._async_get_json_once(endpoint, url))
+
+    async def _async_get_json_once(self, endpoint: str, url: str):
+        """Make one GET attempt, recording its stats.
+
+        When the body is byte-identical to the previous response of the same
+        endpoint, the previously decoded object itself is returned so callers
+        can detect "unchanged" with an identity check.
+        """
+        stats = self.endpoint_stats[endpoint]
+        start = self.hass.loop.time()
+        try:
+            async with self.session.get(url, auth=self.auth, timeout=REQUEST_TIMEOUT) as resp:
+                resp.raise_for_status()
+                body = await resp.read()
+        except asyncio.TimeoutError as err:
+            stats.record_error(err, timeout=True)
+            raise
+        except Exception as err:
+            stats.record_error(err)
+            raise
+        stats.record(self.hass.loop.time() - start, len(body))
+        digest = hashlib.blake2b(body, digest_size=16).digest()
+        cached = self._bodies.get(endpoint)
+        if cached is not None and cached[0] == digest:
+            self.decode_stats["skipped"] += 1
+            return cached[1]
+        data = json_loads(body)
+        self._bodies[endpoint] = (digest, data)
+        self.decode_stats["decoded"] += 1
+        return data
 
     async def _fetch_status(self, base: str) -> dict:
         """Fetch status from the device."""
         try:
             url = f"{base}/cgi-bin/status?outputType=application/json"
             _LOGGER.debug("Fetching status from %s", url)
-            async with self.session.get(url, auth=self.auth) as resp:
-                if resp.status == 200:
-                    data = await resp.json()
-                    _LOGGER.debug("Status response: %s", data)
-                    return data
-                raise Exception(f"Status request failed: {resp.status}")
+            data = await self._async_get_json("status", url)
+            _LOGGER.debug("Status response: %s", data)
+            return data
         except Exception as err:
             _LOGGER.warning("Failed to fetch status: %s", err)
             return {}
@@ -86,11 +569,10 @@ class SavantDataUpdateCoordinator(DataUpdateCoordinator):
         try:
             url = f"{base}/cgi-bin/avswitch?action=showAllAudioPortsInJson"
             _LOGGER.debug("Fetching audio ports from %s", url)
-            async with self.session.get(url, auth=self.auth) as resp:
-                resp.raise_for_status()
-                data = await resp.json()
-                _LOGGER.debug("Audio ports response (raw): %s", data)
-                return data
+            return await self._async_get_json("ports", url)
+        except CircuitOpenError:
+            # Expected while the amp is failing; _async_update_data logs the skipped poll
+            raise
         except Exception as err:
             _LOGGER.error("Failed to fetch audio ports: %s", err)
             raise
@@ -100,37 +582,205 @@ class SavantDataUpdateCoordinator(DataUpdateCoordinator):
         try:
             url = f"{base}/cgi-bin/constants"
             _LOGGER.debug("Fetching constants from %s", url)
-            async with self.session.get(url, auth=self.auth) as resp:
-                resp.raise_for_status()
-                data = await resp.json()
-                _LOGGER.debug("Constants response: %s", data)
-                return data
+            data = await self._async_get_json("constants", url)
+            _LOGGER.debug("Constants response: %s", data)
+            return data
         except Exception as err:
             _LOGGER.warning("Failed to fetch constants: %s", err)
             return {}
 
+    async def _async_write_fields(self, fields: dict) -> None:
+        """Queue setAudio fields and wait for the coalesced POST that carries them.
+
+        Writes arriving within WRITE_COALESCE_WINDOW are merged into a single
+        request, keeping only the last value for each outputN.field.
+        """
+        self.write_stats["calls"] += 1
+        self.write_stats["fields_queued"] += len(fields)
+        self._pending_writes.update(fields)
+        batch = self._write_batch
+        if batch is None:
+            batch = self._write_batch = self.hass.loop.create_future()
+            # Mark the exception as retrieved even if every waiter was cancelled
+            batch.add_done_callback(lambda fut: fut.cancelled() or fut.exception())
+            self._write_timer = self.hass.loop.call_later(WRITE_COALESCE_WINDOW, self._start_write_flush)
+        else:
+            self.write_stats["requests_saved"] += 1
+        await asyncio.shield(batch)
+
+    def _start_write_flush(self) -> None:
+        """Hand the pending writes over to a flush task."""
+        self._write_timer = None
+        fields, self._pending_writes = self._pending_writes, {}
+        batch, self._write_batch = self._write_batch, None
+        self.hass.async_create_task(self._async_flush_writes(fields, batch))
+
+    async def _async_flush_writes(self, fields: dict, batch: asyncio.Future) -> None:
+        """Send one setAudio POST with every coalesced field."""
+        url = f"http://{self.host}/cgi-bin/avswitch?action=setAudio"
+        _LOGGER.debug("Sending batched setAudio to %s with data %s", url, fields)
+        try:
+            await self._pipeline.async_request(lambda: self._async_post_once(url, fields), write=True)
+            self.write_stats["requests_sent"] += 1
+            self.write_stats["fields_sent"] += len(fields)
+        except Exception as err:
+            _LOGGER.error("Batched setAudio failed: %s", err)
+            # The optimistic values never reached the amp, refresh to roll them back
+            self.optimistic_rollbacks += 1
+            self._drop_pending(fields)
+            self.hass.async_create_task(self._confirm_refresh.async_call())
+            batch.set_exception(err)
+            return
+        batch.set_result(None)
+
+    async def async_set_zones(self, zones: dict) -> None:
+        """Apply volume/mute/source changes to several zones in one round trip.
+
+        `zones` maps port -> dict with optional "volume" (0..1), "mute" (bool)
+        and "source" (input id). All fields go out in a single setAudio POST,
+        listeners are updated once and one confirming refresh is requested.
+        """
+        unknown = [port for port in zones if port not in self.data.outputs]
+        if unknown:
+            # Keep them out of the batched POST, where the amp rejecting them would fail every field
+            _LOGGER.warning("Ignoring unknown output ports %s on %s", unknown, self.host)
+            zones = {port: values for port, values in zones.items() if port not in unknown}
+        # Like a manual volume change, a group change wins over a running fade
+        self._cancel_ramps(*(port for port, values in zones.items() if "volume" in values))
+        fields = {}
+        for port, values in zones.items():
+            if "volume" in values:
+                level_db = volume_to_db(values["volume"])
+                fields[f"output{port}.volume"] = str(level_db)
+                self._set_optimistic(port, "volume_db", level_db)
+            if "mute" in values:
+                fields[f"output{port}.mute"] = "muted" if values["mute"] else "not-muted"
+                self._set_optimistic(port, "mute", values["mute"])
+            if "source" in values:
+                fields[f"output{port}.inputsrc"] = str(values["source"])
+                self._set_optimistic(port, "inputsrc", values["source"])
+        if not fields:
+            return
+        _LOGGER.debug("Setting %s zones with fields %s", len(zones), fields)
+        self._async_notify_ports(*zones)
+        await self._async_write_fields(fields)
+        await self._async_note_activity()
+
+    @callback
+    def async_snapshot(self, ports=None, name: str = "default") -> None:
+        """Save source, volume and mute of the given (default all) zones from current data."""
+        outputs = self.data.outputs
+        ports = outputs if ports is None else [port for port in ports if port in outputs]
+        self._snapshots[name] = {
+            port: (outputs[port].inputsrc, outputs[port].volume_db, outputs[port].mute) for port in ports
+        }
+        _LOGGER.debug("Saved snapshot %s of ports %s", name, list(self._snapshots[name]))
+
+    async def async_restore(self, name: str = "default") -> None:
+        """Reapply a snapshot to every zone in it with one setAudio request."""
+        # Kept until the write succeeds, so a failed restore can be retried
+        snapshot = self._snapshots.get(name)
+        if not snapshot:
+            _LOGGER.warning("No snapshot named %s to restore on %s", name, self.host)
+            return
+        self._cancel_ramps(*snapshot)
+        fields = {}
+        for port, (inputsrc, volume_db, mute) in snapshot.items():
+            fields[f"output{port}.inputsrc"] = str(inputsrc)
+            fields[f"output{port}.volume"] = str(volume_db)
+            fields[f"output{port}.mute"] = "muted" if mute else "not-muted"
+            self._set_optimistic(port, "inputsrc", inputsrc)
+            self._set_optimistic(port, "volume_db", volume_db)
+            self._set_optimistic(port, "mute", mute)
+        _LOGGER.debug("Restoring snapshot %s with fields %s", name, fields)
+        self._async_notify_ports(*snapshot)
+        await self._async_write_fields(fields)
+        if self._snapshots.get(name) is snapshot:
+            # Not replaced by a newer snapshot while the write was in flight
+            del self._snapshots[name]
+        await self._async_note_activity()
+
+    def _cancel_ramps(self, *ports: int) -> None:
+        """Take the given ports out of any ramp driving them.
+
+        A ramp over several ports keeps fading the others; it is only
+        cancelled once it has no ports left.
+        """
+        tasks = {self._ramps.pop(port) for port in ports if port in self._ramps}
+        for task in tasks - set(self._ramps.values()):
+            task.cancel()
+
+    async def async_ramp_volume(self, ports, volume: float, duration: float) -> None:
+        """Fade one or more ports to `volume` (0..1) over `duration` seconds.
+
+        Steps are sent as batched setAudio writes at most every
+        RAMP_STEP_INTERVAL, and polling is paused until the fade finishes.
+        """
+        ports = [port for port in ports if port in self.data.outputs]
+        if not ports:
+            return
+        # A new fade takes over from any fade already running on these ports
+        self._cancel_ramps(*ports)
+        task = self.hass.async_create_task(self._async_run_ramp(ports, volume, duration))
+        for port in ports:
+            self._ramps[port] = task
+        try:
+            await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if not task.cancelled():
+                raise
+            _LOGGER.debug("Volume ramp on ports %s was superseded", ports)
+
+    async def _async_run_ramp(self, ports: list, volume: float, duration: float) -> None:
+        task = asyncio.current_task()
+        # Claim the ports here too, in case the task started eagerly before async_ramp_volume did
+        for port in ports:
+            self._ramps[port] = task
+        start_volumes = {port: self.data.outputs[port].volume for port in ports}
+        last_sent = {port: self.data.outputs[port].volume_db for port in ports}
+        steps = max(1, math.ceil(duration / RAMP_STEP_INTERVAL))
+        started = last_write = self.hass.loop.time()
+        _LOGGER.debug("Ramping ports %s to %s over %ss in %s steps", ports, volume, duration, steps)
+        try:
+            for step in range(1, steps + 1):
+                fraction = step / steps
+                fields = {}
+                # Ports taken over by a manual change or another ramp drop out of this one
+                ports = [port for port in ports if self._ramps.get(port) is task]
+                for port in ports:
+                    level_db = volume_to_db(start_volumes[port] + (volume - start_volumes[port]) * fraction)
+                    # Levels are whole dB, so many steps of a slow fade change nothing
+                    if level_db != last_sent[port]:
+                        last_sent[port] = level_db
+                        fields[f"output{port}.volume"] = str(level_db)
+                        self._set_optimistic(port, "volume_db", level_db)
+                if fields:
+                    last_write = self.hass.loop.time()
+                    self._async_notify_ports(*ports)
+                    await self._async_write_fields(fields)
+                if step < steps:
+                    # Follow the fade's schedule, but never write faster than RAMP_STEP_INTERVAL
+                    next_at = max(started + step * duration / steps, last_write + RAMP_STEP_INTERVAL)
+                    await asyncio.sleep(max(0, next_at - self.hass.loop.time()))
+        finally:
+            for port in ports:
+                if self._ramps.get(port) is task:
+                    del self._ramps[port]
+        await self._async_note_activity()
+
     async def async_set_volume(self, port: int, volume: float) -> None:
         """Set volume for a zone with optimistic update and quick refresh."""
+        # A manual change wins over a running fade
+        self._cancel_ramps(port)
         try:
-            level_db = int((volume * 60) - 60)
+            level_db = volume_to_db(volume)
             _LOGGER.debug("Setting volume for port %s to %s (level %s)", port, volume, level_db)
             # Optimistically update the data
-            if self.data and "av" in self.data and "outputs" in self.data["av"]:
-                for output in self.data["av"]["outputs"]:
-                    if output["port"] == port:
-                        output["volume"] = level_db
-                        _LOGGER.debug("Optimistically updated volume in local data")
-                        break
-            self.async_update_listeners()
-            # Make the actual API call
-            url = f"http://{self.host}/cgi-bin/avswitch?action=setAudio"
-            data = {f"output{port}.volume": str(level_db)}
-            _LOGGER.debug("Sending volume update to %s with data %s", url, data)
-            async with self.session.post(url, data=data, auth=self.auth) as resp:
-                resp.raise_for_status()
-                _LOGGER.debug("Successfully set volume via API")
-            # Schedule a refresh 1 second later
-            asyncio.create_task(self._delayed_refresh())
+            self._set_optimistic(port, "volume_db", level_db)
+            self._async_notify_ports(port)
+            await self._async_write_fields({f"output{port}.volume": str(level_db)})
+            _LOGGER.debug("Successfully set volume via API")
+            await self._async_note_activity()
         except Exception as err:
             _LOGGER.error("Failed to set volume for port %s: %s", port, err, exc_info=True)
             raise
@@ -140,59 +790,30 @@ class SavantDataUpdateCoordinator(DataUpdateCoordinator):
         try:
             _LOGGER.debug("Setting mute for port %s to %s", port, mute)
             # Optimistically update the data
-            if self.data and "av" in self.data and "outputs" in self.data["av"]:
-                for output in self.data["av"]["outputs"]:
-                    if output["port"] == port:
-                        output["mute"] = mute
-                        _LOGGER.debug("Optimistically updated mute in local data")
-                        break
-            self.async_update_listeners()
-            # Make the actual API call using setAudio and outputX.mute
-            url = f"http://{self.host}/cgi-bin/avswitch?action=setAudio"
+            self._set_optimistic(port, "mute", mute)
+            self._async_notify_ports(port)
             mute_val = "muted" if mute else "not-muted"
-            data = {f"output{port}.mute": mute_val}
-            _LOGGER.debug("Sending mute update to %s with data %s", url, data)
-            async with self.session.post(url, data=data, auth=self.auth) as resp:
-                resp.raise_for_status()
-                _LOGGER.debug("Successfully set mute via API")
-            # Schedule a refresh 1 second later
-            asyncio.create_task(self._delayed_refresh())
+            await self._async_write_fields({f"output{port}.mute": mute_val})
+            _LOGGER.debug("Successfully set mute via API")
+            await self._async_note_activity()
         except Exception as err:
             _LOGGER.error("Failed to set mute for port %s: %s", port, err, exc_info=True)
             raise
 
-    async def _delayed_refresh(self):
-        await asyncio.sleep(1)
-        await self.async_request_refresh()
-
     async def async_set_source(self, port, source):
         """Set the input source for a zone."""
         _LOGGER.debug("Setting source for port %s to %s", port, source)
         try:
             # Optimistically update local data
-            if "av" in self.data and "outputs" in self.data["av"]:
-                for output in self.data["av"]["outputs"]:
-                    if output["port"] == port:
-                        output["inputsrc"] = source
-                        break
-
-            # Make API call using the correct endpoint format
-            url = f"http://{self.host}/cgi-bin/avswitch"
-            data = {
-                "action": "setAudio",
-                f"output{port}.inputsrc": str(source)
-            }
-            _LOGGER.debug("Sending source update to %s with data %s", url, data)
-            
-            async with self.session.post(url, data=data, auth=self.auth) as response:
-                if response.status != 200:
-                    _LOGGER.error("Failed to set source: %s", await response.text())
-                    raise UpdateFailed(f"Failed to set source: {response.status}")
-                
-                # Request a refresh to confirm the change
-                await self.async_request_refresh()
-                
-                _LOGGER.debug("Successfully set source for port %s to %s", port, source)
+            self._set_optimistic(port, "inputsrc", source)
+            self._async_notify_ports(port)
+
+            await self._async_write_fields({f"output{port}.inputsrc": str(source)})
+
+            # Poll fast and confirm the change shortly
+            await self._async_note_activity()
+
+            _LOGGER.debug("Successfully set source for port %s to %s", port, source)
         except Exception as e:
             _LOGGER.error("Error setting source: %s", str(e), exc_info=True)
-            raise UpdateFailed(f"Error setting source: {str(e)}") 
\ No newline at end of file
+            raise UpdateFailed(f"Error setting source: {str(e)}")
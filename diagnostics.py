@@ -0,0 +1,16 @@
+"""Diagnostics support for Savant IP Audio."""
+from __future__ import annotations
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from .hub import async_get_hub
+
+TO_REDACT = {"username", "password"}
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict:
+    """Return diagnostics for a config entry."""
+    coordinator = async_get_hub(hass).get(entry.entry_id)
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "coordinator": coordinator.diagnostics() if coordinator else None,
+    }
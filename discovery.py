@@ -0,0 +1,92 @@
+"""LAN discovery of Savant IP Audio devices.
+
+Scans are sent without credentials, so the amp's password never goes to
+other hosts on the network; it is only sent to the amp the user picks.
+"""
+from __future__ import annotations
+
+import asyncio
+import ipaddress
+import logging
+
+import aiohttp
+
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+_LOGGER = logging.getLogger(__name__)
+
+# Per-probe timeout; an amp on the LAN answers well within this
+PROBE_TIMEOUT = aiohttp.ClientTimeout(total=1.5)
+# Probes in flight at once while scanning
+PROBE_CONCURRENCY = 64
+# Largest network we agree to scan (a /22)
+MAX_SCAN_HOSTS = 1024
+# An amp that wants credentials for /cgi-bin/constants names itself in the Basic auth realm
+SAVANT_REALM_MARKER = "savant"
+
+
+def hosts_in_network(network: str, port: int | None = None) -> list[str]:
+    """Return the host addresses of a network such as "192.168.1.0/24".
+
+    With `port`, each address gets ":port" appended (handy for simulators).
+    """
+    net = ipaddress.ip_network(network, strict=False)
+    if net.num_addresses > MAX_SCAN_HOSTS + 2:
+        raise ValueError(f"{network} is too large to scan, use at most a /22")
+    hosts = [str(address) for address in net.hosts()] or [str(net.network_address)]
+    if port is not None:
+        hosts = [f"{host}:{port}" for host in hosts]
+    return hosts
+
+
+async def async_probe(
+    session: aiohttp.ClientSession,
+    host: str,
+    auth: aiohttp.BasicAuth | None = None,
+    timeout: aiohttp.ClientTimeout = PROBE_TIMEOUT,
+) -> dict | None:
+    """Probe /cgi-bin/constants on one host; return the amp's identity or None.
+
+    Without `auth`, an amp that answers 401 with a Savant realm is still
+    returned, with an unknown chassis and savantID.
+    """
+    url = f"http://{host}/cgi-bin/constants"
+    try:
+        async with session.get(url, auth=auth, timeout=timeout) as resp:
+            if resp.status == 401 and auth is None:
+                challenge = resp.headers.get("WWW-Authenticate", "")
+                if SAVANT_REALM_MARKER in challenge.lower():
+                    _LOGGER.debug("Found Savant device at %s (credentials required)", host)
+                    return {"host": host, "chassis": None, "savantID": None}
+                return None
+            if resp.status != 200:
+                return None
+            data = json_loads(await resp.read())
+    except (aiohttp.ClientError, asyncio.TimeoutError, ValueError):
+        return None
+    if not isinstance(data, dict) or not (data.get("chassis") or data.get("savantID")):
+        return None
+    _LOGGER.debug("Found Savant device at %s: %s", host, data.get("chassis"))
+    return {"host": host, "chassis": data.get("chassis"), "savantID": data.get("savantID")}
+
+
+async def async_discover(
+    session: aiohttp.ClientSession,
+    hosts: list[str],
+    concurrency: int = PROBE_CONCURRENCY,
+    timeout: aiohttp.ClientTimeout = PROBE_TIMEOUT,
+) -> list[dict]:
+    """Probe many hosts, without credentials, with bounded concurrency and return the amps found."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _probe(host: str):
+        async with semaphore:
+            return await async_probe(session, host, timeout=timeout)
+
+    results = await asyncio.gather(*(_probe(host) for host in hosts))
+    found = [result for result in results if result is not None]
+    _LOGGER.debug("Scanned %s hosts, found %s Savant devices", len(hosts), len(found))
+    return found
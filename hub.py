@@ -0,0 +1,122 @@
+"""Shared hub tracking every Savant IP Audio coordinator in hass.data[DOMAIN]."""
+from __future__ import annotations
+
+import asyncio
+import logging
+
+import aiohttp
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from .const import DOMAIN, MAX_REQUESTS_PER_HOST
+
+_LOGGER = logging.getLogger(__name__)
+
+# How long an idle keep-alive connection to an amp is kept open
+KEEPALIVE_TIMEOUT = 60
+
+
+class SavantHub:
+    """Spreads poll phases across amps and owns one connection pool per host."""
+
+    def __init__(self, hass: HomeAssistant):
+        self.hass = hass
+        self.coordinators = {}  # entry_id -> SavantDataUpdateCoordinator
+        self._sessions = {}  # host -> aiohttp.ClientSession
+        self._request_slots = {}  # host -> asyncio.Semaphore
+        self._stagger_unsubs = []
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, self._async_close_sessions)
+
+    def session_for(self, host: str) -> aiohttp.ClientSession:
+        """Return the keep-alive session dedicated to a host."""
+        session = self._sessions.get(host)
+        if session is None or session.closed:
+            connector = aiohttp.TCPConnector(
+                limit_per_host=MAX_REQUESTS_PER_HOST,
+                keepalive_timeout=KEEPALIVE_TIMEOUT,
+            )
+            session = self._sessions[host] = aiohttp.ClientSession(connector=connector)
+        return session
+
+    def request_slot(self, host: str) -> asyncio.Semaphore:
+        """Return the semaphore bounding in-flight requests to a host."""
+        slot = self._request_slots.get(host)
+        if slot is None:
+            slot = self._request_slots[host] = asyncio.Semaphore(MAX_REQUESTS_PER_HOST)
+        return slot
+
+    def get(self, entry_id: str):
+        return self.coordinators.get(entry_id)
+
+    @callback
+    def async_add(self, entry_id: str, coordinator) -> None:
+        """Track a coordinator and re-spread everyone's poll phase."""
+        self.coordinators[entry_id] = coordinator
+        self._async_stagger()
+
+    async def async_remove(self, entry_id: str) -> None:
+        """Stop tracking a coordinator, shutting it down and closing unused sessions."""
+        coordinator = self.coordinators.pop(entry_id, None)
+        if coordinator is None:
+            return
+        await coordinator.async_shutdown()
+        await self.async_release_host(coordinator.host)
+        self._async_stagger()
+
+    async def async_release_host(self, host: str) -> None:
+        """Close a host's session unless a tracked coordinator still uses it.
+
+        Also for coordinators that never made it into the hub, e.g. when the
+        first refresh failed.
+        """
+        if any(c.host == host for c in self.coordinators.values()):
+            return
+        session = self._sessions.pop(host, None)
+        self._request_slots.pop(host, None)
+        if session is not None:
+            await session.close()
+
+    @callback
+    def _async_stagger(self) -> None:
+        """Offset each coordinator's next poll so the fleet's polls do not line up.
+
+        Coordinators reschedule relative to their last refresh, so kicking
+        coordinator i at i/n of its interval keeps the phases spread out.
+        """
+        for unsub in self._stagger_unsubs:
+            unsub()
+        self._stagger_unsubs = []
+        count = len(self.coordinators)
+        if count < 2:
+            return
+        for index, coordinator in enumerate(self.coordinators.values()):
+            if not coordinator.update_interval:
+                continue
+            # The coordinator schedules on whole seconds, so stagger on whole seconds too
+            offset = round(index * coordinator.update_interval.total_seconds() / count)
+            _LOGGER.debug("Staggering poll for %s by %ss", coordinator.host, offset)
+            self._stagger_unsubs.append(
+                async_call_later(self.hass, max(offset, 1), self._kick_refresh(coordinator))
+            )
+
+    def _kick_refresh(self, coordinator):
+        @callback
+        def _refresh(_now) -> None:
+            self.hass.async_create_task(coordinator.async_refresh())
+
+        return _refresh
+
+    async def _async_close_sessions(self, _event: Event) -> None:
+        for session in self._sessions.values():
+            await session.close()
+        self._sessions = {}
+
+
+@callback
+def async_get_hub(hass: HomeAssistant) -> SavantHub:
+    """Return the shared hub, creating it on first use."""
+    hub = hass.data.get(DOMAIN)
+    if hub is None:
+        hub = hass.data[DOMAIN] = SavantHub(hass)
+    return hub
@@ -0,0 +1,161 @@
+"""Typed, port-indexed state parsed from the Savant IP Audio JSON endpoints."""
+from __future__ import annotations
+
+# Output volume is reported in dB, -60 (silent) .. 0 (full)
+MIN_VOLUME_DB = -60
+
+# Keys of an output entry that are modelled explicitly rather than kept in extras
+_OUTPUT_KEYS = {"port", "id", "volume", "mute", "inputsrc"}
+
+
+def db_to_volume(level_db) -> float:
+    """Convert a dB level to Home Assistant's 0..1 volume."""
+    return max(0.0, min(1.0, (level_db - MIN_VOLUME_DB) / -MIN_VOLUME_DB))
+
+
+def volume_to_db(volume: float) -> int:
+    """Convert a 0..1 volume to the dB level the amp expects."""
+    return int((volume * -MIN_VOLUME_DB) + MIN_VOLUME_DB)
+
+
+def _parse_mute(value) -> bool:
+    if isinstance(value, str):
+        return value.lower() in ("muted", "true", "1", "on")
+    return bool(value)
+
+
+class OutputState:
+    """State of one audio output (zone)."""
+
+    __slots__ = ("port", "name", "inputsrc", "volume_db", "volume", "mute", "extra")
+
+    def __init__(self, port: int, name: str, inputsrc: int, volume_db: int, mute: bool, extra: dict):
+        self.port = port
+        self.name = name
+        self.inputsrc = inputsrc
+        self.volume_db = volume_db
+        self.volume = db_to_volume(volume_db)
+        self.mute = mute
+        self.extra = extra
+
+    @classmethod
+    def from_json(cls, raw: dict) -> OutputState:
+        port = raw["port"]
+        return cls(
+            port=port,
+            name=raw.get("id", f"Output {port}"),
+            inputsrc=raw.get("inputsrc", 0),
+            volume_db=raw.get("volume", MIN_VOLUME_DB),
+            mute=_parse_mute(raw.get("mute", False)),
+            extra={k: v for k, v in raw.items() if k not in _OUTPUT_KEYS},
+        )
+
+    def set_volume_db(self, level_db: int) -> None:
+        """Update the dB level and the derived 0..1 volume together."""
+        self.volume_db = level_db
+        self.volume = db_to_volume(level_db)
+
+    def apply(self, field: str, value) -> None:
+        """Set one commandable field ("inputsrc", "volume_db" or "mute")."""
+        if field == "volume_db":
+            self.set_volume_db(value)
+        else:
+            setattr(self, field, value)
+
+    def __eq__(self, other):
+        if not isinstance(other, OutputState):
+            return NotImplemented
+        return all(getattr(self, slot) == getattr(other, slot) for slot in self.__slots__)
+
+    def __repr__(self):
+        return (
+            f"OutputState(port={self.port}, inputsrc={self.inputsrc}, "
+            f"volume_db={self.volume_db}, mute={self.mute})"
+        )
+
+
+class PendingCommand:
+    """A commanded field value that the amp has not confirmed yet."""
+
+    __slots__ = ("seq", "expected", "deadline")
+
+    def __init__(self, seq: int, expected, deadline: float):
+        self.seq = seq
+        self.expected = expected
+        self.deadline = deadline
+
+
+class InputState:
+    """An audio input as reported by the amp."""
+
+    __slots__ = ("port", "name", "extra")
+
+    def __init__(self, port: int, name: str, extra: dict):
+        self.port = port
+        self.name = name
+        self.extra = extra
+
+    @classmethod
+    def from_json(cls, raw: dict) -> InputState:
+        port = raw["port"]
+        return cls(
+            port=port,
+            name=raw.get("id", f"Input {port}"),
+            extra={k: v for k, v in raw.items() if k not in ("port", "id")},
+        )
+
+    def __eq__(self, other):
+        if not isinstance(other, InputState):
+            return NotImplemented
+        return self.port == other.port and self.name == other.name and self.extra == other.extra
+
+
+class DeviceStatus:
+    """The identity/health fields from /cgi-bin/status."""
+
+    __slots__ = ("chassis", "savant_id", "firmware", "ip_address", "raw")
+
+    def __init__(self, raw: dict):
+        self.chassis = raw.get("chassis")
+        self.savant_id = raw.get("savantID")
+        self.firmware = raw.get("firmwareVersion")
+        self.ip_address = raw.get("ipAddress")
+        self.raw = raw
+
+    def __eq__(self, other):
+        if not isinstance(other, DeviceStatus):
+            return NotImplemented
+        return self.raw == other.raw
+
+
+class SavantState:
+    """One parsed snapshot of the device, with outputs and inputs keyed by port."""
+
+    __slots__ = ("status", "constants", "outputs", "inputs")
+
+    def __init__(self, status: DeviceStatus, constants: dict, outputs: dict, inputs: dict):
+        self.status = status
+        self.constants = constants
+        self.outputs = outputs
+        self.inputs = inputs
+
+    @classmethod
+    def empty(cls) -> SavantState:
+        return cls(DeviceStatus({}), {}, {}, {})
+
+    @classmethod
+    def from_json(cls, status: dict, av: dict, constants: dict) -> SavantState:
+        outputs = {}
+        for raw in av.get("outputs", []):
+            output = OutputState.from_json(raw)
+            outputs[output.port] = output
+        inputs = {}
+        for raw in av.get("inputs", []):
+            inp = InputState.from_json(raw)
+            inputs[inp.port] = inp
+        return cls(DeviceStatus(status), constants, outputs, inputs)
+
+    @property
+    def model(self) -> str:
+        """Prefer model from constants, then status, then fallback."""
+        return self.constants.get("chassis") or self.status.chassis or "Unknown"
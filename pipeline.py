@@ -0,0 +1,132 @@
+"""Per-amp request pipeline: ordering, timeouts, retries and a circuit breaker."""
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import random
+import time
+
+import aiohttp
+
+_LOGGER = logging.getLogger(__name__)
+
+# Hard limit for a single request attempt
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=10)
+# Attempts for writes; polls are not retried because the next poll is the retry
+WRITE_ATTEMPTS = 3
+# Full-jitter exponential backoff between attempts, in seconds
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 5
+# Consecutive failures that open the breaker, and how long it stays open
+BREAKER_THRESHOLD = 5
+BREAKER_COOLDOWN = 60
+
+BREAKER_CLOSED = "closed"
+BREAKER_OPEN = "open"
+BREAKER_HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of sending a request while the amp's breaker is open."""
+
+
+class CircuitBreaker:
+    """Stops talking to an amp after repeated failures until a trial request succeeds."""
+
+    def __init__(self, threshold: int = BREAKER_THRESHOLD, cooldown: float = BREAKER_COOLDOWN):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.state = BREAKER_CLOSED
+        self.failures = 0
+        self.opened = 0
+        self._opened_at = 0.0
+
+    def allow(self) -> bool:
+        """Return True if a request may be sent now."""
+        if self.state == BREAKER_CLOSED:
+            return True
+        if self.state == BREAKER_OPEN and time.monotonic() - self._opened_at >= self.cooldown:
+            # Let a single trial request through
+            self.state = BREAKER_HALF_OPEN
+            return True
+        return False
+
+    def record_success(self) -> None:
+        if self.state != BREAKER_CLOSED:
+            _LOGGER.info("Savant amp recovered, closing circuit breaker")
+        self.state = BREAKER_CLOSED
+        self.failures = 0
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.state == BREAKER_HALF_OPEN or (
+            self.state == BREAKER_CLOSED and self.failures >= self.threshold
+        ):
+            _LOGGER.warning(
+                "Savant amp failed %s requests in a row, pausing requests for %ss",
+                self.failures, self.cooldown,
+            )
+            self.state = BREAKER_OPEN
+            self.opened += 1
+            self._opened_at = time.monotonic()
+
+    def release_trial(self) -> None:
+        """Give back a trial request that ended without an outcome, e.g. because it was cancelled.
+
+        The cooldown has already passed, so the next request becomes the trial.
+        """
+        if self.state == BREAKER_HALF_OPEN:
+            self.state = BREAKER_OPEN
+
+    def as_dict(self) -> dict:
+        return {"state": self.state, "consecutive_failures": self.failures, "times_opened": self.opened}
+
+
+def _is_retryable(err: Exception) -> bool:
+    if isinstance(err, aiohttp.ClientResponseError):
+        # Server errors are worth retrying, auth or bad requests are not
+        return err.status >= 500
+    return isinstance(err, (aiohttp.ClientError, asyncio.TimeoutError))
+
+
+class CommandPipeline:
+    """Runs requests to one amp within its concurrency budget.
+
+    Writes are serialized so they reach the amp in the order they were made,
+    and their retries back off with jitter. Requests are expected to apply
+    REQUEST_TIMEOUT themselves.
+    """
+
+    def __init__(self, request_slot: asyncio.Semaphore, breaker: CircuitBreaker | None = None):
+        self._request_slot = request_slot
+        self._write_lock = asyncio.Lock()
+        self.breaker = breaker or CircuitBreaker()
+        self.retries = 0
+
+    async def async_request(self, request, *, write: bool = False):
+        """Await `request()` (a coroutine factory) through the pipeline."""
+        if not self.breaker.allow():
+            raise CircuitOpenError("Circuit breaker open, not contacting the amp")
+        attempts = WRITE_ATTEMPTS if write else 1
+        try:
+            async with self._write_lock if write else contextlib.nullcontext():
+                for attempt in range(attempts):
+                    try:
+                        async with self._request_slot:
+                            result = await request()
+                    except Exception as err:
+                        self.breaker.record_failure()
+                        if attempt + 1 >= attempts or not _is_retryable(err) or not self.breaker.allow():
+                            raise
+                        delay = random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+                        _LOGGER.debug("Request failed (%s), retrying in %.2fs", err, delay)
+                        self.retries += 1
+                        await asyncio.sleep(delay)
+                    else:
+                        self.breaker.record_success()
+                        return result
+        except BaseException:
+            # A cancelled trial must not leave the breaker half-open, refusing every later request
+            self.breaker.release_trial()
+            raise
@@ -0,0 +1,162 @@
+"""Status, per-zone and diagnostic sensors for Savant IP Audio."""
+from __future__ import annotations
+import logging
+from homeassistant.components.sensor import SensorDeviceClass, SensorEntity, SensorStateClass
+from homeassistant.const import EntityCategory, UnitOfTime
+from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from .const import DOMAIN
+from .coordinator import ENDPOINTS, STATS_CONTEXT
+from .hub import async_get_hub
+
+_LOGGER = logging.getLogger(__name__)
+
+# Status fields already shown on the device itself
+STATUS_IDENTITY_KEYS = {"chassis", "savantID"}
+
+async def async_setup_entry(hass, config_entry, async_add_entities):
+    """Set up the Savant IP Audio sensors."""
+    coordinator = async_get_hub(hass).get(config_entry.entry_id)
+    device_id = coordinator.data.status.savant_id or config_entry.data["host"]
+    entities = []
+    for endpoint in ENDPOINTS:
+        entities.append(SavantEndpointLatencySensor(coordinator, device_id, endpoint))
+        entities.append(SavantEndpointErrorSensor(coordinator, device_id, endpoint))
+    entities.append(SavantLastFetchSensor(coordinator, device_id))
+    # Device health fields from /cgi-bin/status, fed by the regular poll
+    for key, value in coordinator.data.status.raw.items():
+        if key not in STATUS_IDENTITY_KEYS and is_scalar(value) and not isinstance(value, bool):
+            entities.append(SavantStatusSensor(coordinator, device_id, key))
+    # Per-zone extras that used to be media_player attributes
+    for port, output in coordinator.data.outputs.items():
+        for key, value in output.extra.items():
+            if is_scalar(value) and not isinstance(value, bool):
+                entities.append(SavantZoneSensor(coordinator, device_id, port, key))
+    async_add_entities(entities)
+
+def is_scalar(value) -> bool:
+    """Return True for values that fit in an entity state."""
+    return isinstance(value, (str, int, float, bool))
+
+class SavantStatusSensor(CoordinatorEntity, SensorEntity):
+    """One field of the device status.
+
+    Status is fetched every STATUS_REFRESH_INTERVAL (30 minutes), not with
+    every poll; homeassistant.update_entity fetches it right away.
+    """
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(self, coordinator, device_id, key):
+        super().__init__(coordinator)
+        self._key = key
+        self._attr_unique_id = f"{device_id}_status_{key}"
+        self._attr_name = f"Savant {device_id[:12]} {key}"
+        self._attr_device_info = DeviceInfo(identifiers={(DOMAIN, device_id)})
+        if isinstance(coordinator.data.status.raw.get(key), (int, float)):
+            self._attr_state_class = SensorStateClass.MEASUREMENT
+
+    @property
+    def native_value(self):
+        return self.coordinator.data.status.raw.get(self._key)
+
+    async def async_update(self) -> None:
+        """Fetch status now rather than only the port state."""
+        await self.coordinator.async_request_status_refresh()
+
+class SavantZoneSensor(CoordinatorEntity, SensorEntity):
+    """A non-boolean per-output field, such as a signal or streamer detail."""
+
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(self, coordinator, device_id, port, key):
+        # Only notified when this output changes
+        super().__init__(coordinator, context=port)
+        self._port = port
+        self._key = key
+        self._attr_unique_id = f"{device_id}_zone_{port}_{key}"
+        self._attr_name = f"Savant {device_id[:12]} Output {port} {key}"
+        self._attr_device_info = DeviceInfo(identifiers={(DOMAIN, device_id)})
+
+    @property
+    def native_value(self):
+        output = self.coordinator.data.outputs.get(self._port)
+        return output.extra.get(self._key) if output else None
+
+class SavantDiagnosticSensor(CoordinatorEntity, SensorEntity):
+    """Base for sensors reading the coordinator's instrumentation."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(self, coordinator, device_id, key, name):
+        # Stats change on every poll, so listen with the stats context
+        super().__init__(coordinator, context=STATS_CONTEXT)
+        self._device_id = device_id
+        self._attr_unique_id = f"{device_id}_{key}"
+        self._attr_name = f"Savant {device_id[:12]} {name}"
+        self._attr_device_info = DeviceInfo(identifiers={(DOMAIN, device_id)})
+
+    @property
+    def available(self):
+        # Diagnostics are most useful exactly when polls fail
+        return True
+
+class SavantEndpointLatencySensor(SavantDiagnosticSensor):
+    """Mean request latency of one endpoint."""
+
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(self, coordinator, device_id, endpoint):
+        super().__init__(coordinator, device_id, f"{endpoint}_latency", f"{endpoint} latency")
+        self._endpoint = endpoint
+
+    @property
+    def native_value(self):
+        return self.coordinator.endpoint_stats[self._endpoint].mean_latency_ms
+
+    @property
+    def extra_state_attributes(self):
+        stats = self.coordinator.endpoint_stats[self._endpoint].as_dict()
+        return {
+            "last_latency_ms": stats["last_latency_ms"],
+            "latency_histogram": stats["latency_histogram"],
+            "requests": stats["requests"],
+            "bytes_received": stats["bytes_received"],
+        }
+
+class SavantEndpointErrorSensor(SavantDiagnosticSensor):
+    """Error count of one endpoint."""
+
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+
+    def __init__(self, coordinator, device_id, endpoint):
+        super().__init__(coordinator, device_id, f"{endpoint}_errors", f"{endpoint} errors")
+        self._endpoint = endpoint
+
+    @property
+    def native_value(self):
+        return self.coordinator.endpoint_stats[self._endpoint].errors
+
+    @property
+    def extra_state_attributes(self):
+        stats = self.coordinator.endpoint_stats[self._endpoint]
+        return {"timeouts": stats.timeouts, "last_error": stats.last_error}
+
+class SavantLastFetchSensor(SavantDiagnosticSensor):
+    """Time of the last successful port poll."""
+
+    _attr_device_class = SensorDeviceClass.TIMESTAMP
+
+    def __init__(self, coordinator, device_id):
+        super().__init__(coordinator, device_id, "last_fetch", "last successful fetch")
+
+    @property
+    def native_value(self):
+        return self.coordinator.endpoint_stats["ports"].last_success
+
+    @property
+    def extra_state_attributes(self):
+        return {"optimistic_rollbacks": self.coordinator.optimistic_rollbacks}
@@ -0,0 +1,107 @@
+"""Domain services for Savant IP Audio."""
+import logging
+
+import voluptuous as vol
+from homeassistant.core import HomeAssistant, ServiceCall, callback
+from homeassistant.exceptions import HomeAssistantError
+import homeassistant.helpers.config_validation as cv
+
+from .const import DOMAIN
+from .hub import async_get_hub
+
+_LOGGER = logging.getLogger(__name__)
+
+SERVICE_SET_ZONES = "set_zones"
+SERVICE_RAMP_VOLUME = "ramp_volume"
+SERVICE_SNAPSHOT = "snapshot"
+SERVICE_RESTORE = "restore"
+
+ZONE_SCHEMA = vol.Schema({
+    vol.Required("port"): vol.Coerce(int),
+    vol.Optional("volume"): vol.All(vol.Coerce(float), vol.Range(min=0, max=1)),
+    vol.Optional("mute"): cv.boolean,
+    vol.Optional("source"): vol.Any(vol.Coerce(int), cv.string),
+})
+
+SET_ZONES_SCHEMA = vol.Schema({
+    vol.Optional("config_entry_id"): cv.string,
+    vol.Required("zones"): vol.All(cv.ensure_list, [ZONE_SCHEMA]),
+})
+
+RAMP_VOLUME_SCHEMA = vol.Schema({
+    vol.Optional("config_entry_id"): cv.string,
+    vol.Required("ports"): vol.All(cv.ensure_list, [vol.Coerce(int)]),
+    vol.Required("volume"): vol.All(vol.Coerce(float), vol.Range(min=0, max=1)),
+    vol.Required("duration"): vol.All(vol.Coerce(float), vol.Range(min=0, max=3600)),
+})
+
+SNAPSHOT_SCHEMA = vol.Schema({
+    vol.Optional("config_entry_id"): cv.string,
+    vol.Optional("ports"): vol.All(cv.ensure_list, [vol.Coerce(int)]),
+    vol.Optional("name", default="default"): cv.string,
+})
+
+RESTORE_SCHEMA = vol.Schema({
+    vol.Optional("config_entry_id"): cv.string,
+    vol.Optional("name", default="default"): cv.string,
+})
+
+
+def _get_coordinator(hass: HomeAssistant, entry_id: str | None):
+    """Find the coordinator a service call is aimed at."""
+    coordinators = async_get_hub(hass).coordinators
+    if entry_id is not None:
+        if entry_id not in coordinators:
+            raise HomeAssistantError(f"Unknown Savant IP Audio entry: {entry_id}")
+        return coordinators[entry_id]
+    if len(coordinators) != 1:
+        raise HomeAssistantError("config_entry_id is required when more than one amp is configured")
+    return next(iter(coordinators.values()))
+
+
+def _resolve_source(coordinator, source):
+    """Translate a source name or id into an input id."""
+    if isinstance(source, int):
+        return source
+    for input_id, name in coordinator.input_names.items():
+        if name == source:
+            return input_id
+    raise HomeAssistantError(f"Unknown source: {source}")
+
+
+@callback
+def async_register_services(hass: HomeAssistant) -> None:
+    """Register the integration's domain services."""
+
+    async def async_set_zones(call: ServiceCall) -> None:
+        coordinator = _get_coordinator(hass, call.data.get("config_entry_id"))
+        zones = {}
+        for zone in call.data["zones"]:
+            values = {k: v for k, v in zone.items() if k != "port"}
+            if "source" in values:
+                values["source"] = _resolve_source(coordinator, values["source"])
+            zones.setdefault(zone["port"], {}).update(values)
+        # An unknown outputN would go into the shared batched POST and could fail every field in it
+        unknown = sorted(port for port in zones if port not in coordinator.data.outputs)
+        if unknown:
+            raise HomeAssistantError(f"Unknown output port(s) on {coordinator.host}: {unknown}")
+        _LOGGER.debug("set_zones service called for %s", zones)
+        await coordinator.async_set_zones(zones)
+
+    async def async_ramp_volume(call: ServiceCall) -> None:
+        coordinator = _get_coordinator(hass, call.data.get("config_entry_id"))
+        _LOGGER.debug("ramp_volume service called with %s", call.data)
+        await coordinator.async_ramp_volume(call.data["ports"], call.data["volume"], call.data["duration"])
+
+    async def async_snapshot(call: ServiceCall) -> None:
+        coordinator = _get_coordinator(hass, call.data.get("config_entry_id"))
+        coordinator.async_snapshot(call.data.get("ports"), call.data["name"])
+
+    async def async_restore(call: ServiceCall) -> None:
+        coordinator = _get_coordinator(hass, call.data.get("config_entry_id"))
+        await coordinator.async_restore(call.data["name"])
+
+    hass.services.async_register(DOMAIN, SERVICE_SET_ZONES, async_set_zones, schema=SET_ZONES_SCHEMA)
+    hass.services.async_register(DOMAIN, SERVICE_RAMP_VOLUME, async_ramp_volume, schema=RAMP_VOLUME_SCHEMA)
+    hass.services.async_register(DOMAIN, SERVICE_SNAPSHOT, async_snapshot, schema=SNAPSHOT_SCHEMA)
+    hass.services.async_register(DOMAIN, SERVICE_RESTORE, async_restore, schema=RESTORE_SCHEMA)
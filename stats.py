@@ -0,0 +1,82 @@
+"""Per-endpoint request instrumentation for the Savant IP Audio coordinator."""
+from __future__ import annotations
+
+from datetime import datetime
+
+from homeassistant.util import dt as dt_util
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is open ended
+LATENCY_BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class EndpointStats:
+    """Request counts, latency histogram and payload sizes for one endpoint."""
+
+    __slots__ = (
+        "requests",
+        "errors",
+        "timeouts",
+        "bytes_received",
+        "latency_total_ms",
+        "last_latency_ms",
+        "histogram",
+        "last_success",
+        "last_error",
+    )
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.bytes_received = 0
+        self.latency_total_ms = 0.0
+        self.last_latency_ms = None
+        self.histogram = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.last_success: datetime | None = None
+        self.last_error = None
+
+    def record(self, latency: float, size: int) -> None:
+        """Record a successful request that took `latency` seconds."""
+        latency_ms = latency * 1000
+        self.requests += 1
+        self.bytes_received += size
+        self.latency_total_ms += latency_ms
+        self.last_latency_ms = round(latency_ms, 1)
+        self.last_success = dt_util.utcnow()
+        for index, bound in enumerate(LATENCY_BUCKETS_MS):
+            if latency_ms <= bound:
+                self.histogram[index] += 1
+                break
+        else:
+            self.histogram[-1] += 1
+
+    def record_error(self, err: Exception, timeout: bool = False) -> None:
+        self.requests += 1
+        self.errors += 1
+        if timeout:
+            self.timeouts += 1
+        self.last_error = repr(err)
+
+    @property
+    def successes(self) -> int:
+        return self.requests - self.errors
+
+    @property
+    def mean_latency_ms(self) -> float | None:
+        if not self.successes:
+            return None
+        return round(self.latency_total_ms / self.successes, 1)
+
+    def as_dict(self) -> dict:
+        buckets = [f"<={bound}ms" for bound in LATENCY_BUCKETS_MS] + [f">{LATENCY_BUCKETS_MS[-1]}ms"]
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "bytes_received": self.bytes_received,
+            "mean_latency_ms": self.mean_latency_ms,
+            "last_latency_ms": self.last_latency_ms,
+            "latency_histogram": dict(zip(buckets, self.histogram)),
+            "last_success": self.last_success.isoformat() if self.last_success else None,
+            "last_error": self.last_error,
+        }
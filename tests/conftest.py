@@ -0,0 +1,5 @@
+"""Make the Home Assistant-free modules (pipeline, models) importable on their own."""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,164 @@
+"""Tests for the circuit breaker and the request pipeline."""
+import asyncio
+
+import pytest
+
+pytest.importorskip("aiohttp")
+
+import pipeline  # noqa: E402
+from pipeline import (  # noqa: E402
+    BREAKER_CLOSED,
+    BREAKER_HALF_OPEN,
+    BREAKER_OPEN,
+    CircuitBreaker,
+    CircuitOpenError,
+    CommandPipeline,
+)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(pipeline.time, "monotonic", clock)
+    return clock
+
+
+def open_breaker(breaker: CircuitBreaker) -> None:
+    for _ in range(breaker.threshold):
+        breaker.record_failure()
+
+
+def test_opens_after_threshold(clock):
+    breaker = CircuitBreaker(threshold=3, cooldown=60)
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == BREAKER_CLOSED
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == BREAKER_OPEN
+    assert not breaker.allow()
+    assert breaker.opened == 1
+
+
+def test_success_resets_failure_count(clock):
+    breaker = CircuitBreaker(threshold=2)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == BREAKER_CLOSED
+
+
+def test_single_trial_after_cooldown(clock):
+    breaker = CircuitBreaker(threshold=1, cooldown=60)
+    open_breaker(breaker)
+    clock.now += 59
+    assert not breaker.allow()
+    clock.now += 1
+    assert breaker.allow()
+    assert breaker.state == BREAKER_HALF_OPEN
+    # Only one trial at a time
+    assert not breaker.allow()
+
+
+def test_trial_success_closes(clock):
+    breaker = CircuitBreaker(threshold=1, cooldown=60)
+    open_breaker(breaker)
+    clock.now += 60
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == BREAKER_CLOSED
+    assert breaker.allow()
+
+
+def test_trial_failure_reopens_for_another_cooldown(clock):
+    breaker = CircuitBreaker(threshold=1, cooldown=60)
+    open_breaker(breaker)
+    clock.now += 60
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == BREAKER_OPEN
+    assert not breaker.allow()
+    clock.now += 60
+    assert breaker.allow()
+
+
+def test_released_trial_can_be_retried_at_once(clock):
+    breaker = CircuitBreaker(threshold=1, cooldown=60)
+    open_breaker(breaker)
+    clock.now += 60
+    assert breaker.allow()
+    breaker.release_trial()
+    assert breaker.state == BREAKER_OPEN
+    assert breaker.allow()
+    assert breaker.state == BREAKER_HALF_OPEN
+
+
+def test_release_trial_ignores_closed_breaker(clock):
+    breaker = CircuitBreaker()
+    breaker.release_trial()
+    assert breaker.state == BREAKER_CLOSED
+
+
+def test_cancelled_trial_does_not_wedge_breaker(clock):
+    """A trial cancelled by a sibling's CircuitOpenError must not stay half-open."""
+    breaker = CircuitBreaker(threshold=1, cooldown=60)
+    open_breaker(breaker)
+    clock.now += 60
+
+    async def run():
+        requests = CommandPipeline(asyncio.Semaphore(2), breaker)
+        started = asyncio.Event()
+
+        async def slow():
+            started.set()
+            await asyncio.sleep(10)
+
+        async def fast():
+            await started.wait()
+            return "ok"
+
+        with pytest.raises(ExceptionGroup):
+            async with asyncio.TaskGroup() as tg:
+                # The first request takes the trial, the second is refused and cancels it
+                tg.create_task(requests.async_request(slow))
+                tg.create_task(requests.async_request(fast))
+        assert breaker.state == BREAKER_OPEN
+        assert await requests.async_request(fast) == "ok"
+        assert breaker.state == BREAKER_CLOSED
+
+    asyncio.run(run())
+
+
+def test_refused_request_raises_circuit_open(clock):
+    breaker = CircuitBreaker(threshold=1, cooldown=60)
+    open_breaker(breaker)
+
+    async def run():
+        requests = CommandPipeline(asyncio.Semaphore(1), breaker)
+        with pytest.raises(CircuitOpenError):
+            await requests.async_request(lambda: asyncio.sleep(0))
+
+    asyncio.run(run())
+
+
+def test_failed_request_is_recorded(clock):
+    breaker = CircuitBreaker(threshold=1, cooldown=60)
+
+    async def failing():
+        raise ValueError("bad body")
+
+    async def run():
+        requests = CommandPipeline(asyncio.Semaphore(1), breaker)
+        with pytest.raises(ValueError):
+            await requests.async_request(failing)
+
+    asyncio.run(run())
+    assert breaker.state == BREAKER_OPEN
@@ -0,0 +1,288 @@
+"""End-to-end latency/throughput benchmark against the local device simulator.
+
+Drives SavantDataUpdateCoordinator and SavantZone against a simulated amp
+and reports:
+
+- poll latency (p50/p95/max)
+- event-loop (CPU) time per poll
+- command-to-confirmed-state latency
+- HTTP requests per user action for a slider drag and an "all zones" change
+
+Needs Home Assistant and aiohttp installed. Example:
+
+    python tools/benchmark.py --zones 6 --delay 0.02 --jitter 0.01 --json bench_output.json
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import importlib
+import importlib.util
+import json
+import logging
+import statistics
+import sys
+import tempfile
+import time
+from datetime import timedelta
+from pathlib import Path
+
+import aiohttp
+
+from simulator import SavantSimulator, ThreadedSimulator
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+PACKAGE = "savant_ipaudio"
+
+
+def load_integration():
+    """Import the repository as the `savant_ipaudio` package."""
+    if PACKAGE not in sys.modules:
+        spec = importlib.util.spec_from_file_location(
+            PACKAGE, REPO_ROOT / "__init__.py", submodule_search_locations=[str(REPO_ROOT)]
+        )
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[PACKAGE] = module
+        spec.loader.exec_module(module)
+    return (
+        importlib.import_module(f"{PACKAGE}.coordinator"),
+        importlib.import_module(f"{PACKAGE}.media_player"),
+    )
+
+
+async def async_create_hass(config_dir: str):
+    """Create a bare HomeAssistant instance good enough to run a coordinator."""
+    from homeassistant.core import HomeAssistant
+    from homeassistant.helpers import frame
+
+    hass = HomeAssistant(config_dir)
+    if hasattr(frame, "async_setup"):
+        frame.async_setup(hass)
+    return hass
+
+
+def make_zone_class(media_player):
+    """SavantZone that renders its state on write instead of going through the state machine."""
+
+    class BenchZone(media_player.SavantZone):
+        writes = 0
+
+        def async_write_ha_state(self):
+            type(self).writes += 1
+            # Touch what HA would read for a state write
+            (self.state, self.volume_level, self.is_volume_muted, self.source,
+             self.source_list, self.extra_state_attributes)
+
+    return BenchZone
+
+
+def percentile(values: list, pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(values: list) -> dict:
+    return {
+        "count": len(values),
+        "p50_ms": round(percentile(values, 50) * 1000, 2),
+        "p95_ms": round(percentile(values, 95) * 1000, 2),
+        "max_ms": round(max(values) * 1000, 2) if values else 0.0,
+        "mean_ms": round(statistics.fmean(values) * 1000, 2) if values else 0.0,
+    }
+
+
+class Bench:
+    """One coordinator plus its zones wired to a simulator."""
+
+    def __init__(
+        self, hass, coordinator_mod, media_player, simulator: SavantSimulator, host: str, interval: float, hub=None
+    ):
+        self.hass = hass
+        self.simulator = simulator
+        self.coordinator = coordinator_mod.SavantDataUpdateCoordinator(
+            hass,
+            host,
+            aiohttp.BasicAuth("RPM", "RPM"),
+            update_interval=timedelta(seconds=interval),
+            name=f"bench-{host}",
+            hub=hub,
+        )
+        self.zone_class = make_zone_class(media_player)
+        self.zones = []
+        self.polls = []  # (loop time, {port: (inputsrc, volume_db, mute)})
+        self.poll_latencies = []  # seconds per completed _async_update_data
+        original = self.coordinator._async_update_data
+
+        async def recorded_update():
+            start = time.perf_counter()
+            data = await original()
+            self.poll_latencies.append(time.perf_counter() - start)
+            self.polls.append((
+                hass.loop.time(),
+                {port: (o.inputsrc, o.volume_db, o.mute) for port, o in data.outputs.items()},
+            ))
+            return data
+
+        self.coordinator._async_update_data = recorded_update
+
+    async def async_setup(self) -> None:
+        await self.coordinator.async_config_entry_first_refresh()
+        data = self.coordinator.data
+        input_names = {port: inp.name for port, inp in data.inputs.items()}
+        input_names.setdefault(0, "Off")
+        self.coordinator.input_names = input_names
+        output_names = {port: out.name for port, out in data.outputs.items()}
+        for port in data.outputs:
+            zone = self.zone_class(
+                port, self.coordinator, input_names, output_names,
+                model=data.status.chassis, unique_id=data.status.savant_id,
+                firmware=data.status.firmware, ip_address=data.status.ip_address,
+            )
+            zone.hass = self.hass
+            await zone.async_added_to_hass()
+            self.zones.append(zone)
+
+    async def async_teardown(self) -> None:
+        for zone in self.zones:
+            await zone.async_will_remove_from_hass()
+        await self.coordinator.async_shutdown()
+
+    async def async_wait_confirmed(self, since: float, port: int, volume_db: int, timeout: float = 15.0) -> float:
+        """Wait for a poll after `since` that reports the expected volume; return its time."""
+        deadline = self.hass.loop.time() + timeout
+        while self.hass.loop.time() < deadline:
+            for when, outputs in self.polls:
+                if when >= since and outputs.get(port, (None, None))[1] == volume_db:
+                    return when
+            await asyncio.sleep(0.005)
+        raise TimeoutError(f"Port {port} never confirmed volume {volume_db}")
+
+
+async def bench_polls(bench: Bench, iterations: int) -> dict:
+    latencies = []
+    loop_times = []
+    for _ in range(iterations):
+        cpu = time.thread_time()
+        start = time.perf_counter()
+        await bench.coordinator.async_refresh()
+        latencies.append(time.perf_counter() - start)
+        loop_times.append(time.thread_time() - cpu)
+    return {"latency": summarize(latencies), "loop_time": summarize(loop_times)}
+
+
+async def bench_confirm(bench: Bench, iterations: int) -> dict:
+    latencies = []
+    zone = bench.zones[0]
+    for i in range(iterations):
+        volume = 0.2 + (i % 2) * 0.4
+        start = bench.hass.loop.time()
+        await zone.async_set_volume_level(volume)
+        expected = bench.coordinator.data.outputs[zone._port].volume_db
+        confirmed = await bench.async_wait_confirmed(start, zone._port, expected)
+        latencies.append(confirmed - start)
+    return {"latency": summarize(latencies)}
+
+
+async def async_settle(bench: Bench, quiet: float) -> None:
+    """Wait until no request has hit the simulator for `quiet` seconds."""
+    last = -1
+    while bench.simulator.total_requests != last:
+        last = bench.simulator.total_requests
+        await asyncio.sleep(quiet)
+
+
+async def bench_slider(bench: Bench, steps: int, spacing: float) -> dict:
+    await async_settle(bench, 1.5)
+    before = bench.simulator.total_requests
+    zone = bench.zones[0]
+    tasks = []
+    for step in range(steps):
+        tasks.append(bench.hass.async_create_task(zone.async_set_volume_level(step / steps)))
+        await asyncio.sleep(spacing)
+    await asyncio.gather(*tasks)
+    await asyncio.sleep(1.5)
+    requests = bench.simulator.total_requests - before
+    return {"actions": steps, "requests": requests, "requests_per_action": round(requests / steps, 3)}
+
+
+async def bench_all_zones(bench: Bench) -> dict:
+    await async_settle(bench, 1.5)
+    before = bench.simulator.total_requests
+    await asyncio.gather(*(zone.async_set_volume_level(0.5) for zone in bench.zones))
+    await asyncio.gather(*(zone.async_select_source(zone.source_list[1]) for zone in bench.zones))
+    await asyncio.sleep(1.5)
+    actions = 2 * len(bench.zones)
+    requests = bench.simulator.total_requests - before
+    return {"actions": actions, "requests": requests, "requests_per_action": round(requests / actions, 3)}
+
+
+async def async_run(args) -> dict:
+    coordinator_mod, media_player = load_integration()
+    simulator = SavantSimulator(
+        zones=args.zones, inputs=args.inputs, delay=args.delay,
+        jitter=args.jitter, error_rate=args.error_rate, seed=1,
+    )
+    server = ThreadedSimulator(simulator)
+    host = server.start()
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = await async_create_hass(config_dir)
+        bench = Bench(hass, coordinator_mod, media_player, simulator, host, args.interval)
+        try:
+            await bench.async_setup()
+            results = {
+                "config": vars(args),
+                "poll": await bench_polls(bench, args.iterations),
+                "confirm": await bench_confirm(bench, max(1, args.iterations // 5)),
+                "slider": await bench_slider(bench, args.slider_steps, args.slider_spacing),
+                "all_zones": await bench_all_zones(bench),
+                "state_writes": bench.zone_class.writes,
+                "simulator_requests": dict(simulator.requests),
+            }
+        finally:
+            await bench.async_teardown()
+            await hass.async_stop(force=True)
+            server.stop()
+    return results
+
+
+def print_report(results: dict) -> None:
+    poll = results["poll"]
+    print(f"poll latency     p50 {poll['latency']['p50_ms']} ms  p95 {poll['latency']['p95_ms']} ms  "
+          f"max {poll['latency']['max_ms']} ms")
+    print(f"loop time/poll   p50 {poll['loop_time']['p50_ms']} ms  p95 {poll['loop_time']['p95_ms']} ms")
+    confirm = results["confirm"]["latency"]
+    print(f"confirm latency  p50 {confirm['p50_ms']} ms  p95 {confirm['p95_ms']} ms")
+    for key in ("slider", "all_zones"):
+        row = results[key]
+        print(f"{key:<16} {row['requests']} requests for {row['actions']} actions "
+              f"({row['requests_per_action']} per action)")
+    print(f"state writes     {results['state_writes']}")
+    print(f"requests served  {results['simulator_requests']}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Savant IP Audio benchmark")
+    parser.add_argument("--zones", type=int, default=6)
+    parser.add_argument("--inputs", type=int, default=5)
+    parser.add_argument("--delay", type=float, default=0.01)
+    parser.add_argument("--jitter", type=float, default=0.005)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--interval", type=float, default=30, help="idle poll interval in seconds")
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--slider-steps", type=int, default=20)
+    parser.add_argument("--slider-spacing", type=float, default=0.03)
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    results = asyncio.run(async_run(args))
+    print_report(results)
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
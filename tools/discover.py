@@ -0,0 +1,72 @@
+"""Scan a network for Savant IP Audio amps using the integration's discovery code.
+
+    python tools/discover.py 192.168.1.0/24
+    python tools/discover.py 127.0.0.0/28 --port 8080 --simulate 3
+
+With --simulate N, N simulators are started on 127.0.0.1..127.0.0.N first, so
+discovery can be exercised without hardware (Linux routes all of 127/8 to lo).
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import importlib.util
+import time
+from pathlib import Path
+
+import aiohttp
+
+from simulator import SavantSimulator
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def load_discovery():
+    """Import discovery.py on its own; it does not depend on Home Assistant."""
+    spec = importlib.util.spec_from_file_location("savant_discovery", REPO_ROOT / "discovery.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+async def async_run(args) -> None:
+    discovery = load_discovery()
+    simulators = []
+    for index in range(args.simulate):
+        simulator = SavantSimulator(savant_id=f"0050c2sim{index:07d}", delay=args.delay)
+        await simulator.start(f"127.0.0.{index + 1}", args.port)
+        simulators.append(simulator)
+    try:
+        hosts = discovery.hosts_in_network(args.network, args.port)
+        auth = aiohttp.BasicAuth(args.username, args.password)
+        start = time.perf_counter()
+        async with aiohttp.ClientSession() as session:
+            found = await discovery.async_discover(session, hosts, concurrency=args.concurrency)
+            # Credentials only go to the amps found, as in the config flow's pick step
+            for index, device in enumerate(found):
+                if not device["savantID"]:
+                    found[index] = await discovery.async_probe(session, device["host"], auth) or device
+        elapsed = time.perf_counter() - start
+    finally:
+        for simulator in simulators:
+            await simulator.stop()
+    for device in found:
+        print(f"{device['host']:<22} {device['chassis'] or '?':<16} {device['savantID'] or '?'}")
+    print(f"Scanned {len(hosts)} hosts in {elapsed:.2f}s, found {len(found)}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Discover Savant IP Audio amps")
+    parser.add_argument("network", help="network to scan, e.g. 192.168.1.0/24")
+    parser.add_argument("--port", type=int, help="HTTP port, if not 80")
+    parser.add_argument("--username", default="RPM")
+    parser.add_argument("--password", default="RPM")
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--simulate", type=int, default=0, help="start this many local simulators first")
+    parser.add_argument("--delay", type=float, default=0.0, help="simulator response delay")
+    args = parser.parse_args()
+    asyncio.run(async_run(args))
+
+
+if __name__ == "__main__":
+    main()
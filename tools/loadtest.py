@@ -0,0 +1,231 @@
+"""Scale test: many simulated amps and hundreds of zones in one Home Assistant instance.
+
+Starts `--amps` simulators, wires a SavantDataUpdateCoordinator (through the
+shared hub, as in production) and a SavantZone set to each, then runs a
+realistic mix of polls and user commands for `--duration` seconds. Reports:
+
+- event-loop lag (how late a 100ms timer fires)
+- state writes per second
+- memory per zone (tracemalloc, measured across setup)
+- HTTP requests per minute
+
+Each run is appended to a JSON-lines history file together with the git
+revision, and compared with the previous run so scaling regressions show up
+before a release:
+
+    python tools/loadtest.py --amps 24 --zones 8 --duration 120
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import importlib
+import json
+import logging
+import random
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+from benchmark import REPO_ROOT, PACKAGE, Bench, async_create_hass, load_integration, summarize
+from simulator import SavantSimulator, ThreadedSimulator
+
+DEFAULT_HISTORY = Path(__file__).resolve().parent / "loadtest_history.jsonl"
+LAG_PROBE_INTERVAL = 0.1
+# Metrics compared against the previous run, and whether higher is worse
+TRACKED = {
+    "loop_lag_p95_ms": True,
+    "loop_lag_max_ms": True,
+    "state_writes_per_second": True,
+    "memory_per_zone_kb": True,
+    "requests_per_minute": True,
+    "poll_latency_p95_ms": True,
+}
+
+
+def git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def measure_loop_lag(stop: asyncio.Event, lags: list) -> None:
+    """Record how late a periodic timer fires; that is time the loop was busy."""
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + LAG_PROBE_INTERVAL
+        await asyncio.sleep(LAG_PROBE_INTERVAL)
+        lags.append(max(0.0, loop.time() - expected))
+
+
+async def drive_commands(benches: list, rate_per_minute: float, stop: asyncio.Event, counts: dict) -> None:
+    """Issue a random mix of slider drags, mutes, source changes and group changes."""
+    rng = random.Random(7)
+    tasks = set()
+    while not stop.is_set():
+        await asyncio.sleep(rng.expovariate(rate_per_minute / 60))
+        bench = rng.choice(benches)
+        zone = rng.choice(bench.zones)
+        action = rng.random()
+        if action < 0.5:
+            # A slider drag: a burst of volume events
+            for step in range(rng.randint(3, 12)):
+                tasks.add(asyncio.ensure_future(zone.async_set_volume_level(rng.random())))
+                await asyncio.sleep(0.03)
+            counts["volume_drags"] += 1
+        elif action < 0.7:
+            tasks.add(asyncio.ensure_future(zone.async_mute_volume(not zone.is_volume_muted)))
+            counts["mutes"] += 1
+        elif action < 0.9:
+            tasks.add(asyncio.ensure_future(zone.async_select_source(rng.choice(zone.source_list))))
+            counts["sources"] += 1
+        else:
+            zones = {z._port: {"volume": rng.random(), "source": 0} for z in bench.zones}
+            tasks.add(asyncio.ensure_future(bench.coordinator.async_set_zones(zones)))
+            counts["group_changes"] += 1
+        tasks = {task for task in tasks if not task.done()}
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def async_run(args) -> dict:
+    coordinator_mod, media_player = load_integration()
+    hub_mod = importlib.import_module(f"{PACKAGE}.hub")
+    server = ThreadedSimulator()
+    server.start()
+    simulators = []
+    hosts = []
+    for index in range(args.amps):
+        simulator = SavantSimulator(
+            zones=args.zones, inputs=args.inputs, delay=args.delay, jitter=args.jitter,
+            savant_id=f"0050c2{index:010d}", seed=index,
+        )
+        hosts.append(server.add(simulator))
+        simulators.append(simulator)
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = await async_create_hass(config_dir)
+        hub = hub_mod.async_get_hub(hass)
+        benches = []
+        try:
+            tracemalloc.start()
+            memory_before = tracemalloc.get_traced_memory()[0]
+            for index, (simulator, host) in enumerate(zip(simulators, hosts)):
+                bench = Bench(hass, coordinator_mod, media_player, simulator, host, args.interval, hub=hub)
+                await bench.async_setup()
+                hub.async_add(f"loadtest-{index}", bench.coordinator)
+                benches.append(bench)
+            memory_after = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            total_zones = sum(len(bench.zones) for bench in benches)
+
+            writes_before = sum(bench.zone_class.writes for bench in benches)
+            requests_before = sum(simulator.total_requests for simulator in simulators)
+            for bench in benches:
+                bench.polls.clear()
+                bench.poll_latencies.clear()
+            lags = []
+            counts = {"volume_drags": 0, "mutes": 0, "sources": 0, "group_changes": 0}
+            stop = asyncio.Event()
+            start = time.perf_counter()
+            lag_task = asyncio.ensure_future(measure_loop_lag(stop, lags))
+            command_task = asyncio.ensure_future(drive_commands(benches, args.commands_per_minute, stop, counts))
+            await asyncio.sleep(args.duration)
+            stop.set()
+            await asyncio.gather(lag_task, command_task)
+            elapsed = time.perf_counter() - start
+
+            writes = sum(bench.zone_class.writes for bench in benches) - writes_before
+            requests = sum(simulator.total_requests for simulator in simulators) - requests_before
+            # Every poll of every amp during the run, not just each amp's last one
+            poll_latencies = [latency for bench in benches for latency in bench.poll_latencies]
+            lag = summarize(lags)
+            result = {
+                "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "revision": git_revision(),
+                "config": vars(args),
+                "zones": total_zones,
+                "commands": counts,
+                "loop_lag_p95_ms": lag["p95_ms"],
+                "loop_lag_max_ms": lag["max_ms"],
+                "state_writes_per_second": round(writes / elapsed, 2),
+                "memory_per_zone_kb": round((memory_after - memory_before) / total_zones / 1024, 2),
+                "requests_per_minute": round(requests / elapsed * 60, 1),
+                "poll_latency_p95_ms": summarize(poll_latencies)["p95_ms"],
+            }
+        finally:
+            for bench in benches:
+                await bench.async_teardown()
+            await hass.async_stop(force=True)
+            server.stop()
+    return result
+
+
+def load_previous(history: Path, config: dict) -> dict | None:
+    """Return the last recorded run with the same configuration (amps, zones, timing and load)."""
+    if not history.exists():
+        return None
+    previous = None
+    keys = ("amps", "zones", "inputs", "interval", "commands_per_minute", "delay", "jitter", "duration")
+    for line in history.read_text().splitlines():
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            continue
+        if all(entry.get("config", {}).get(key) == config.get(key) for key in keys):
+            previous = entry
+    return previous
+
+
+def print_report(result: dict, previous: dict | None, tolerance: float) -> bool:
+    """Print the run and return False if a tracked metric regressed beyond tolerance."""
+    print(f"{result['config']['amps']} amps, {result['zones']} zones, revision {result['revision']}")
+    print(f"commands issued  {result['commands']}")
+    ok = True
+    for metric, higher_is_worse in TRACKED.items():
+        value = result[metric]
+        line = f"{metric:<26} {value}"
+        if previous and previous.get(metric):
+            change = (value - previous[metric]) / previous[metric]
+            line += f"  ({change:+.1%} vs {previous.get('revision')})"
+            if (change if higher_is_worse else -change) > tolerance:
+                line += "  REGRESSION"
+                ok = False
+        print(line)
+    return ok
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Savant IP Audio scale test")
+    parser.add_argument("--amps", type=int, default=24)
+    parser.add_argument("--zones", type=int, default=8)
+    parser.add_argument("--inputs", type=int, default=5)
+    parser.add_argument("--delay", type=float, default=0.02)
+    parser.add_argument("--jitter", type=float, default=0.01)
+    parser.add_argument("--interval", type=float, default=15, help="idle poll interval in seconds")
+    parser.add_argument("--duration", type=float, default=60)
+    parser.add_argument("--commands-per-minute", type=float, default=30)
+    parser.add_argument("--history", type=Path, default=DEFAULT_HISTORY)
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative worsening per metric")
+    parser.add_argument("--no-record", action="store_true", help="do not append this run to the history")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    result = asyncio.run(async_run(args))
+    config = {k: (str(v) if isinstance(v, Path) else v) for k, v in result["config"].items()}
+    result["config"] = config
+    previous = load_previous(args.history, config)
+    ok = print_report(result, previous, args.tolerance)
+    if not args.no_record:
+        with args.history.open("a") as history:
+            history.write(json.dumps(result) + "\n")
+    raise SystemExit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
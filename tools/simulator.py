@@ -0,0 +1,223 @@
+"""Local Savant IP Audio device simulator.
+
+Implements the CGI endpoints the integration talks to:
+
+- /cgi-bin/status?outputType=application/json
+- /cgi-bin/constants
+- /cgi-bin/avswitch?action=showAllAudioPortsInJson
+- /cgi-bin/avswitch?action=setAudio (form POST with outputN.field values)
+
+Run standalone with `python tools/simulator.py --zones 6 --port 8080` and point
+the integration at `127.0.0.1:8080`, or embed `SavantSimulator` in benchmarks.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import base64
+import logging
+import random
+import threading
+import time
+from collections import Counter
+
+from aiohttp import web
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class SavantSimulator:
+    """In-memory Savant IP Audio amp served over aiohttp."""
+
+    def __init__(
+        self,
+        zones: int = 6,
+        inputs: int = 5,
+        delay: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        apply_delay: float = 0.0,
+        username: str = "RPM",
+        password: str = "RPM",
+        savant_id: str = "0050c2abcdef0001",
+        seed: int | None = None,
+    ):
+        self.delay = delay
+        self.jitter = jitter
+        self.error_rate = error_rate
+        # Time before a setAudio change shows up in showAllAudioPortsInJson
+        self.apply_delay = apply_delay
+        self._auth = "Basic " + base64.b64encode(f"{username}:{password}".encode()).decode()
+        self._random = random.Random(seed)
+        self.status = {
+            "chassis": "PAV-SIPA125SM",
+            "savantID": savant_id,
+            "firmwareVersion": "1.0.0-sim",
+            "ipAddress": "127.0.0.1",
+            "uptime": 0,
+            "temperature": 40,
+        }
+        self.constants = {
+            "chassis": "PAV-SIPA125SM",
+            "savantID": savant_id,
+            "inputCount": inputs,
+            "outputCount": zones,
+        }
+        self.inputs = [{"port": p, "id": f"Input {p}", "signal": p == 1} for p in range(1, inputs + 1)]
+        self.outputs = [
+            {"port": p, "id": f"Output {p}", "inputsrc": 0, "volume": -40, "mute": False, "signal": False}
+            for p in range(1, zones + 1)
+        ]
+        self.requests = Counter()
+        self.fields_written = 0
+        self._started = time.monotonic()
+        self._runner: web.AppRunner | None = None
+        self.host = None
+
+    def make_app(self) -> web.Application:
+        app = web.Application(middlewares=[self._middleware])
+        app.router.add_get("/cgi-bin/status", self._handle_status)
+        app.router.add_get("/cgi-bin/constants", self._handle_constants)
+        app.router.add_route("*", "/cgi-bin/avswitch", self._handle_avswitch)
+        return app
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Start serving and return the `host:port` to configure the integration with."""
+        self._runner = web.AppRunner(self.make_app(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        bound_port = self._runner.addresses[0][1]
+        self.host = f"{host}:{bound_port}"
+        _LOGGER.debug("Simulator listening on %s", self.host)
+        return self.host
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler):
+        if request.headers.get("Authorization") != self._auth:
+            return web.Response(status=401, headers={"WWW-Authenticate": 'Basic realm="savant"'})
+        delay = self.delay + (self._random.uniform(0, self.jitter) if self.jitter else 0)
+        if delay:
+            await asyncio.sleep(delay)
+        if self.error_rate and self._random.random() < self.error_rate:
+            self.requests["error"] += 1
+            return web.Response(status=500, text="Internal Server Error")
+        return await handler(request)
+
+    async def _handle_status(self, request: web.Request) -> web.Response:
+        self.requests["status"] += 1
+        self.status["uptime"] = int(time.monotonic() - self._started)
+        return web.json_response(self.status)
+
+    async def _handle_constants(self, request: web.Request) -> web.Response:
+        self.requests["constants"] += 1
+        return web.json_response(self.constants)
+
+    async def _handle_avswitch(self, request: web.Request) -> web.Response:
+        form = await request.post() if request.method == "POST" else {}
+        action = request.query.get("action") or form.get("action")
+        if action == "showAllAudioPortsInJson":
+            self.requests["ports"] += 1
+            return web.json_response({"inputs": self.inputs, "outputs": self.outputs})
+        if action == "setAudio" and request.method == "POST":
+            self.requests["setAudio"] += 1
+            changes = [(key, value) for key, value in form.items() if key.startswith("output")]
+            if self.apply_delay:
+                asyncio.get_running_loop().call_later(self.apply_delay, self._apply, changes)
+            else:
+                self._apply(changes)
+            return web.Response(text="OK")
+        self.requests["unknown"] += 1
+        return web.Response(status=400, text=f"Unknown action: {action}")
+
+    def _apply(self, changes: list) -> None:
+        for key, value in changes:
+            name, _, field = key.partition(".")
+            try:
+                output = self.outputs[int(name[len("output"):]) - 1]
+            except (ValueError, IndexError):
+                continue
+            if field == "volume":
+                output["volume"] = int(value)
+            elif field == "mute":
+                output["mute"] = value == "muted"
+            elif field == "inputsrc":
+                output["inputsrc"] = int(value)
+                output["signal"] = int(value) != 0
+            else:
+                continue
+            self.fields_written += 1
+
+    @property
+    def total_requests(self) -> int:
+        return sum(self.requests.values())
+
+
+class ThreadedSimulator:
+    """Run SavantSimulators on their own event loop in a background thread.
+
+    Keeps the simulators' CPU time out of the measurements taken on the
+    caller's event loop.
+    """
+
+    def __init__(self, simulator: SavantSimulator | None = None):
+        self.simulator = simulator
+        self.simulators = []
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+
+    def start(self, host: str = "127.0.0.1", port: int = 0) -> str | None:
+        """Start the thread, and the simulator given at construction if any."""
+        self._thread.start()
+        if self.simulator is not None:
+            return self.add(self.simulator, host, port)
+        return None
+
+    def add(self, simulator: SavantSimulator, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Start another simulator on the running thread and return its host."""
+        future = asyncio.run_coroutine_threadsafe(simulator.start(host, port), self.loop)
+        self.simulators.append(simulator)
+        return future.result()
+
+    def stop(self) -> None:
+        for simulator in self.simulators:
+            asyncio.run_coroutine_threadsafe(simulator.stop(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Savant IP Audio device simulator")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--zones", type=int, default=6)
+    parser.add_argument("--inputs", type=int, default=5)
+    parser.add_argument("--delay", type=float, default=0.0, help="base response delay in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="extra random delay up to this many seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with HTTP 500")
+    parser.add_argument("--apply-delay", type=float, default=0.0, help="seconds before setAudio changes show up")
+    parser.add_argument("--username", default="RPM")
+    parser.add_argument("--password", default="RPM")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    simulator = SavantSimulator(
+        zones=args.zones,
+        inputs=args.inputs,
+        delay=args.delay,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        apply_delay=args.apply_delay,
+        username=args.username,
+        password=args.password,
+    )
+    web.run_app(simulator.make_app(), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()